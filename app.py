@@ -1,13 +1,13 @@
-from scripts.resume_parser import extract_text_from_pdf
-from sentence_transformers import SentenceTransformer
-from scripts.text_processing import preprocess_text
-from scripts.gemini_matcher import get_llm_feedback
-from scripts.matcher import calculate_match_score, load_model
+from scripts.pdf_cache import extract_pdf_cached
+from scripts.jd_fetch import fetch_job_description
+from scripts.gemini_matcher import submit_llm_feedback
+from scripts.artifacts import get_default_store, score_artifacts
+from scripts.registry import get_model, warm_up
+from scripts import metrics
 from dotenv import load_dotenv
 import streamlit as st
 import subprocess
 import asyncio
-import spacy
 import time
 import sys
 import os
@@ -27,29 +27,21 @@ if sys.platform.startswith("win") and sys.version_info >= (3, 8):
 # Load environment variables
 load_dotenv()
 
-# Initialize model only once
-if "model" not in st.session_state:
-    with st.spinner("Loading model, please wait..."):
-        model = load_model()
-        if model is None:
-            st.error("Failed to load AI model. Please refresh or try again later.")
-            st.stop()
-        st.session_state.model = model
-
-
-# Load spaCy model if not already loaded
-if "spacy_loaded" not in st.session_state:
-    nlp = spacy.load("en_core_web_sm")
-
 # App title
 st.title("Samarth - Resume Matcher")
 
 # Upload resume
 uploaded_file = st.file_uploader("Upload Your Resume (PDF)", type=["pdf"])
-if uploaded_file and "resume_text" not in st.session_state:
+if uploaded_file:
+    # Keyed by a hash of the file bytes: a re-upload of the same resume is
+    # not parsed again, and a different file replaces the stored text
     with st.spinner("Extracting text from resume..."):
-        st.session_state.resume_text = extract_text_from_pdf(uploaded_file)
-    st.success("Resume uploaded ✅")
+        extracted = extract_pdf_cached(uploaded_file)
+    if st.session_state.get("resume_sha256") != extracted.sha256:
+        st.session_state.resume_sha256 = extracted.sha256
+        st.session_state.resume_text = extracted.text
+        st.session_state.pop("scores", None)
+        st.success("Resume uploaded ✅")
 
 # Show resume content
 if "resume_text" in st.session_state:
@@ -68,19 +60,41 @@ if jd_option == "Text Input":
     if job_description:
         st.session_state.job_description = job_description
 elif jd_option == "URL (LinkedIn/Naukri/Foundit)":
-    st.text_input("Enter the job posting URL")
-    st.error("Scraping from URLs is not supported yet. Please use text input.")
+    jd_url = st.text_input("Enter the job posting URL").strip()
+    # Fetch once per URL, failed or not, so reruns don't refetch it; the
+    # fetcher's cache revalidates repeat URLs
+    failed_url, fetch_error = st.session_state.get("jd_url_error", (None, None))
+    if jd_url and jd_url not in (st.session_state.get("jd_url"), failed_url):
+        with st.spinner("Fetching job description..."):
+            fetched = fetch_job_description(jd_url)
+        if fetched.error or not fetched.text:
+            failed_url, fetch_error = jd_url, fetched.error or "no text found"
+            st.session_state.jd_url_error = (failed_url, fetch_error)
+        else:
+            st.session_state.jd_url = jd_url
+            st.session_state.job_description = fetched.text
+            st.session_state.jd_title = fetched.title
+    if jd_url and jd_url == failed_url:
+        st.error(
+            "Could not read a job description from that page "
+            f"({fetch_error}). Please use text input."
+        )
+    if jd_url and st.session_state.get("jd_url") == jd_url:
+        with st.expander(st.session_state.jd_title or "Show Job Description"):
+            st.write(st.session_state.job_description)
 
 
 # Resume processing function
-def process_resume(resume_text, job_description):
+def process_resume(model, resume_text, job_description):
     start_time = time.time()
 
-    processed_resume = preprocess_text(resume_text)
-    processed_jd = preprocess_text(job_description)
-    scores = calculate_match_score(
-        st.session_state.model, processed_resume, processed_jd
-    )
+    # Each document's tokens, embeddings and keywords are kept between runs,
+    # so editing only the JD (or only the resume) recomputes just that side
+    store = get_default_store()
+    chunking = os.getenv("SAMARTH_CHUNKING") or None
+    resume = store.get(model, resume_text, chunking)
+    jd = store.get(model, job_description, chunking)
+    scores = score_artifacts(resume, jd, os.getenv("SAMARTH_POOLING", "mean"))
 
     end_time = time.time()
     time_taken = round(end_time - start_time, 2)
@@ -95,9 +109,16 @@ if st.button("Process Resume"):
     elif "job_description" not in st.session_state:
         st.error("Please provide a job description.")
     else:
+        # Loaded once per process and shared by every session; usually
+        # already in memory thanks to the warm-up started below
+        with st.spinner("Loading model, please wait..."):
+            model = get_model()
+        if model is None:
+            st.error("Failed to load AI model. Please refresh or try again later.")
+            st.stop()
         with st.spinner("Matching in progress..."):
             scores, time_taken = process_resume(
-                st.session_state.resume_text, st.session_state.job_description
+                model, st.session_state.resume_text, st.session_state.job_description
             )
             st.session_state.scores = scores
             st.session_state.time_taken = time_taken
@@ -121,19 +142,38 @@ if "scores" in st.session_state:
         st.caption(f"Resume Experience: {scores['resume_exp']} years")
         st.caption(f"JD Required Experience: {scores['jd_exp']} years")
 
+    if metrics.is_enabled():
+        with st.expander("See Stage Timings"):
+            st.json(metrics.snapshot()["stages"])
+
     # AI Insights
     if st.toggle("💡 Get AI Insights"):
-        with st.spinner("Generating insights with Gemini..."):
-            insights = get_llm_feedback(
-                st.session_state.resume_text, st.session_state.job_description
-            )
-        st.markdown("#### Gemini LLM Insights")
-        st.markdown(f"**Score:** {insights['score']}/100")
-        st.markdown("**Feedback:**")
-        for point in insights["feedback"]:
-            st.markdown(f"- {point}")
-
-        feedback_text = f"""Gemini LLM Score: {insights['score']}/100
+        # Gemini runs in a background thread so the page keeps rendering;
+        # the fragment polls it and reruns the app once the reply is in
+        request = (st.session_state.resume_text, st.session_state.job_description)
+        if st.session_state.get("insights_request") != request:
+            st.session_state.insights_request = request
+            st.session_state.insights_future = submit_llm_feedback(*request)
+        insights_future = st.session_state.insights_future
+
+        if not insights_future.done():
+
+            @st.fragment(run_every=1)
+            def wait_for_insights():
+                if insights_future.done():
+                    st.rerun()
+                st.info("Generating insights with Gemini...")
+
+            wait_for_insights()
+        else:
+            insights = insights_future.result()
+            st.markdown("#### Gemini LLM Insights")
+            st.markdown(f"**Score:** {insights['score']}/100")
+            st.markdown("**Feedback:**")
+            for point in insights["feedback"]:
+                st.markdown(f"- {point}")
+
+            feedback_text = f"""Gemini LLM Score: {insights['score']}/100
 
             AI Feedback:
             - {insights['feedback'][0]}
@@ -152,15 +192,19 @@ if "scores" in st.session_state:
             JD Required Experience: {scores['jd_exp']} years
             """
 
-        # Download insights as .txt button
-        st.download_button(
-            label="📄 Download Feedback",
-            data=feedback_text,
-            file_name="samarth_feedback.txt",
-            mime="text/plain",
-        )
+            # Download insights as .txt button
+            st.download_button(
+                label="📄 Download Feedback",
+                data=feedback_text,
+                file_name="samarth_feedback.txt",
+                mime="text/plain",
+            )
 
 # Footer
 st.markdown(
     "Built by [Ujjwal Tyagi](https://ujjwaltyagi2000.github.io/) | [GitHub](https://github.com/ujjwaltyagi2000/samarth.ai)"
 )
+
+# Load the model and heavy libraries in the background now that the page
+# has rendered, so the first match does not pay for them
+warm_up()
@@ -0,0 +1,87 @@
+"""Import time of the app's modules, each measured in a fresh interpreter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_imports                # the default modules
+    python -m benchmarks.bench_imports scripts.matcher --details
+
+A module only pays for a heavy library when it imports it at the top, so
+this is the check that startup stays fast as the code changes.
+"""
+
+import subprocess
+import argparse
+import json
+import sys
+
+MODULES = (
+    "scripts.metrics",
+    "scripts.registry",
+    "scripts.text_processing",
+    "scripts.resume_parser",
+    "scripts.gemini_matcher",
+    "scripts.structured_parser",
+    "scripts.matcher",
+    "streamlit",
+    "sentence_transformers",
+    "nltk",
+    "fitz",
+)
+
+_SNIPPET = (
+    "import time, importlib; start = time.perf_counter(); "
+    "importlib.import_module({module!r}); print(time.perf_counter() - start)"
+)
+
+
+def measure_import(module):
+    """Seconds to import module in a new interpreter, or None if it fails."""
+    result = subprocess.run(
+        [sys.executable, "-c", _SNIPPET.format(module=module)],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    return round(float(result.stdout.strip().splitlines()[-1]), 4)
+
+
+def import_details(module, limit=15):
+    """The slowest imports pulled in by module, from python -X importtime.
+
+    Returns (cumulative_seconds, name) pairs, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        entries.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(entries, reverse=True)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(MODULES))
+    parser.add_argument(
+        "--details", action="store_true", help="list the slowest nested imports"
+    )
+    args = parser.parse_args(argv)
+
+    report = {module: measure_import(module) for module in args.modules}
+    print(json.dumps(report, indent=2))
+
+    if args.details:
+        for module in args.modules:
+            print(f"\n{module}")
+            for seconds, name in import_details(module):
+                print(f"  {seconds:8.3f}s  {name}")
+
+
+if __name__ == "__main__":
+    main()
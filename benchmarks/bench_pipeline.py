@@ -0,0 +1,251 @@
+"""Benchmark for the matching pipeline on a synthetic resume/JD corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pipeline                  # print a report
+    python -m benchmarks.bench_pipeline --save-baseline  # record baseline.json
+    python -m benchmarks.bench_pipeline --check          # fail on regressions
+"""
+
+from scripts.constants import GENERAL_SKILLS, EDUCATION_KEYWORDS, JOB_ROLES
+from scripts.constants import KEYWORD_MATCHER
+from scripts.matcher import (
+    _combine_scores,
+    _keyword_profile,
+    extract_years_of_experience,
+    rank_resumes,
+)
+from scripts.resume_parser import extract_text_from_pdf
+from scripts.text_processing import preprocess_text
+from scripts.embedding_cache import EmbeddingCache
+import argparse
+import random
+import json
+import time
+import sys
+import os
+
+BASELINE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "baseline.json"
+)
+
+FILLER = [
+    "Worked closely with cross-functional teams to deliver projects on time.",
+    "Designed and maintained reporting pipelines used by several departments.",
+    "Mentored junior colleagues and reviewed their work regularly.",
+    "Improved internal processes and documented best practices.",
+    "Presented findings to senior stakeholders and clients.",
+    "Owned the roadmap for a customer facing product area.",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct"]
+
+
+def _skills(rng, count):
+    category = rng.choice(list(GENERAL_SKILLS))
+    pool = GENERAL_SKILLS[category] + rng.choice(list(GENERAL_SKILLS.values()))
+    return rng.sample(pool, min(count, len(pool)))
+
+
+def make_resume(rng, paragraphs=6):
+    role = rng.choice(JOB_ROLES)
+    lines = [
+        "Candidate Name",
+        "candidate@example.com | +1 555 010 1234",
+        f"{role.title()} with {rng.randint(1, 15)} years of experience",
+        "",
+        "Experience",
+    ]
+    year = 2024
+    for _ in range(rng.randint(2, 4)):
+        start = year - rng.randint(1, 4)
+        lines.append(
+            f"{rng.choice(JOB_ROLES).title()} {rng.choice(MONTHS)} {start} - "
+            f"{rng.choice(MONTHS)} {year}"
+        )
+        lines.extend(rng.sample(FILLER, 2))
+        year = start
+    lines += ["", "Skills", ", ".join(_skills(rng, 12)), "", "Education"]
+    lines.append(
+        f"{rng.choice(['Bachelor', 'Master', 'PhD'])} in "
+        f"{rng.choice(EDUCATION_KEYWORDS).title()}"
+    )
+    lines += rng.choices(FILLER, k=paragraphs)
+    return "\n".join(lines)
+
+
+def make_job_description(rng):
+    role = rng.choice(JOB_ROLES)
+    return "\n".join(
+        [
+            f"We are hiring a {role}.",
+            f"Required: {rng.randint(1, 8)}+ years of experience.",
+            f"Must have: {', '.join(_skills(rng, 8))}.",
+            f"Education: {rng.choice(EDUCATION_KEYWORDS)} degree or equivalent.",
+            *rng.sample(FILLER, 3),
+        ]
+    )
+
+
+def make_corpus(n_resumes, n_jds, seed=0):
+    rng = random.Random(seed)
+    resumes = [make_resume(rng) for _ in range(n_resumes)]
+    jds = [make_job_description(rng) for _ in range(n_jds)]
+    return resumes, jds
+
+
+def make_pdf(text):
+    import fitz
+
+    doc = fitz.open()
+    lines = text.splitlines()
+    for start in range(0, len(lines), 40):
+        page = doc.new_page()
+        page.insert_textbox(
+            fitz.Rect(50, 50, 550, 800), "\n".join(lines[start : start + 40])
+        )
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, items_per_sample=1):
+    total = sum(samples)
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "throughput_per_s": (
+            round(len(samples) * items_per_sample / total, 2) if total else None
+        ),
+    }
+
+
+def _timed(samples, stage, fn, *args):
+    start_time = time.perf_counter()
+    result = fn(*args)
+    samples.setdefault(stage, []).append(time.perf_counter() - start_time)
+    return result
+
+
+def bench_single(model, resumes, jds):
+    """Times each stage of the single pair path, one resume and one JD at a time."""
+    samples = {}
+    pdfs = [make_pdf(text) for text in resumes]
+    for index, pdf in enumerate(pdfs):
+        jd = jds[index % len(jds)]
+        pair_start = time.perf_counter()
+        text = _timed(samples, "pdf_extraction", extract_text_from_pdf, pdf)
+        resume = _timed(samples, "preprocess_text", preprocess_text, text)
+        jd = _timed(samples, "preprocess_text", preprocess_text, jd)
+        if model is not None:
+            _timed(samples, "embedding", model.encode, [resume, jd])
+        _timed(samples, "keyword_extraction", KEYWORD_MATCHER.find, resume)
+        _timed(samples, "experience_regex", extract_years_of_experience, resume)
+        resume_profile = _keyword_profile(resume)
+        jd_profile = _keyword_profile(jd)
+        _timed(samples, "scoring", _combine_scores, 0.5, resume_profile, jd_profile)
+        samples.setdefault("pair_total", []).append(time.perf_counter() - pair_start)
+    return {stage: summarize(values) for stage, values in samples.items()}
+
+
+def bench_batch(model, resumes, jds):
+    """Times rank_resumes over the whole pool for each JD, with a cold cache."""
+    if model is None:
+        return {}
+    processed = [preprocess_text(text) for text in resumes]
+    samples = []
+    for jd in jds:
+        processed_jd = preprocess_text(jd)
+        start_time = time.perf_counter()
+        rank_resumes(model, processed_jd, processed, top_k=10, cache=EmbeddingCache())
+        samples.append(time.perf_counter() - start_time)
+    return {"rank_resumes": summarize(samples, items_per_sample=len(resumes))}
+
+
+def compare(report, baseline, tolerance, slack_ms=0.1):
+    """Returns a list of regressions of p50/p95 beyond the tolerance.
+
+    slack_ms is added to every limit so sub-millisecond stages do not fail
+    on timer noise.
+    """
+    regressions = []
+    for mode in ("single", "batch"):
+        for stage, stats in baseline.get(mode, {}).items():
+            current = report.get(mode, {}).get(stage)
+            if current is None:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                limit = stats[metric] * (1 + tolerance) + slack_ms
+                if current[metric] > limit:
+                    regressions.append(
+                        f"{mode}.{stage}.{metric}: {current[metric]} > {round(limit, 3)}"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--jds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-model", action="store_true", help="skip embedding")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%"
+    )
+    args = parser.parse_args(argv)
+
+    model = None
+    if not args.no_model:
+        from scripts.matcher import load_model
+
+        model = load_model()
+        if model is None:
+            print("Model unavailable, skipping embedding stages")
+
+    resumes, jds = make_corpus(args.resumes, args.jds, args.seed)
+    report = {
+        "config": {
+            "resumes": args.resumes,
+            "jds": args.jds,
+            "seed": args.seed,
+            "model": getattr(model, "cache_name", None),
+        },
+        "single": bench_single(model, resumes, jds),
+        "batch": bench_batch(model, resumes, jds),
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}, run with --save-baseline first")
+            return 1
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print("Performance regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
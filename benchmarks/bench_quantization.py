@@ -0,0 +1,65 @@
+"""Memory and ranking agreement of quantized embedding storage.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_quantization                    # model embeddings
+    python -m benchmarks.bench_quantization --no-model --vectors 100000
+
+Each method is compared with exact util.cos_sim top-k over the same
+vectors, before and after exact re-scoring of the candidates.
+"""
+
+from scripts.quantization import METHODS, ranking_agreement
+from benchmarks.bench_pipeline import make_corpus
+import numpy as np
+import argparse
+import json
+
+
+def make_embeddings(n_vectors, n_queries, seed=0, model=None):
+    """Resume embeddings and JD query embeddings from the synthetic corpus,
+    or clustered random vectors when no model is given."""
+    if model is not None:
+        resumes, jds = make_corpus(n_vectors, n_queries, seed)
+        return (
+            model.encode(resumes, batch_size=64, convert_to_numpy=True),
+            model.encode(jds, batch_size=64, convert_to_numpy=True),
+        )
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((64, 384)).astype(np.float32)
+    labels = rng.integers(0, len(centers), n_vectors + n_queries)
+    vectors = centers[labels] + 0.5 * rng.standard_normal((len(labels), 384)).astype(
+        np.float32
+    )
+    return vectors[:n_vectors], vectors[n_vectors:]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-model", action="store_true", help="random vectors")
+    args = parser.parse_args(argv)
+
+    model = None
+    if not args.no_model:
+        from scripts.matcher import load_model
+
+        model = load_model()
+        if model is None:
+            print("Model unavailable, using random vectors")
+
+    embeddings, queries = make_embeddings(args.vectors, args.queries, args.seed, model)
+    report = [
+        ranking_agreement(embeddings, queries, method, args.top_k, args.rerank)
+        for method in METHODS
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from scripts.text_processing import DEFAULT_MODE, preprocess
+from scripts.embedding_cache import encode_cached, model_cache_name
+from scripts.chunking import chunk_document, pooled_similarity
+from scripts.structured_parser import ResumeRecord, parse_document
+from scripts.matcher import _combine_scores
+from scripts.metrics import timer, increment
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+import threading
+import hashlib
+
+
+@dataclass(frozen=True, slots=True)
+class DocumentArtifacts:
+    """Intermediate results for one document, reused across rescoring runs.
+
+    embeddings has one row per chunk, or a single row when the document is
+    encoded whole. record holds the contacts, keyword sets and years of
+    experience, parsed from the raw text.
+    """
+
+    processed: str
+    tokens: tuple
+    embeddings: np.ndarray
+    record: ResumeRecord
+
+
+class ArtifactStore:
+    """LRU of DocumentArtifacts keyed by the raw text and how it was built.
+
+    When only the job description changes, the resume's artifacts come
+    straight from here and only the JD is preprocessed, parsed and encoded.
+    """
+
+    def __init__(self, max_items=256):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, model, text, chunking=None, mode=None, cache=None):
+        mode = mode or DEFAULT_MODE
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = (model_cache_name(model), chunking, mode, digest)
+        with self._lock:
+            artifacts = self._items.get(key)
+            if artifacts is not None:
+                self._items.move_to_end(key)
+                increment("artifact_cache_hits")
+                return artifacts
+
+        increment("artifact_cache_misses")
+        with timer("build_artifacts"):
+            artifacts = build_artifacts(model, text, chunking, mode, cache)
+        with self._lock:
+            self._items[key] = artifacts
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return artifacts
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+def build_artifacts(model, text, chunking=None, mode=None, cache=None):
+    processed = preprocess(text, mode)
+    chunks = (
+        chunk_document(model, processed.text, chunking)
+        if chunking
+        else [processed.text]
+    )
+    return DocumentArtifacts(
+        processed=processed.text,
+        tokens=tuple(processed.tokens),
+        embeddings=encode_cached(model, chunks, cache=cache),
+        # Preprocessing splits emails and phone numbers into tokens, so the
+        # record comes from the raw text; its keywords are the same either way
+        record=parse_document(text),
+    )
+
+
+def score_artifacts(resume, job_description, pooling="mean"):
+    """Recombines cached artifacts into the calculate_match_score breakdown."""
+    if len(resume.embeddings) == 1 and len(job_description.embeddings) == 1:
+        from sentence_transformers import util
+
+        semantic_score = util.cos_sim(
+            resume.embeddings[0], job_description.embeddings[0]
+        ).item()
+    else:
+        semantic_score = pooled_similarity(
+            resume.embeddings, job_description.embeddings, pooling
+        )
+    return _combine_scores(
+        semantic_score,
+        resume.record.keyword_profile(),
+        job_description.record.keyword_profile(),
+    )
+
+
+_default_store = ArtifactStore()
+
+
+def get_default_store():
+    return _default_store
@@ -0,0 +1,128 @@
+from scripts.embedding_cache import encode_cached
+import numpy as np
+import re
+
+CHUNKING_MODES = ("window", "section")
+POOLING_MODES = ("mean", "max", "maxsim")
+
+# Resume headings, matched on a line of their own (optionally ending in ":")
+SECTION_PATTERNS = {
+    "experience": r"(?:work |professional )?experience|employment(?: history)?|work history",
+    "skills": r"(?:technical |key |core )?skills|technologies|tools",
+    "education": r"education|academics?|qualifications",
+    "projects": r"(?:personal |academic )?projects",
+    "summary": r"summary|profile|objective|about(?: me)?",
+    "certifications": r"certifications?|courses|trainings?",
+}
+SECTION_REGEX = re.compile(
+    r"^\s*(?:"
+    + "|".join(f"(?P<{name}>{pattern})" for name, pattern in SECTION_PATTERNS.items())
+    + r")\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def split_sections(text):
+    """Splits text at heading lines into (section, text) pairs.
+
+    Text before the first heading is labelled "header". A document without
+    recognised headings comes back as a single "document" section.
+    """
+    matches = list(SECTION_REGEX.finditer(text))
+    if not matches:
+        return [("document", text)] if text.strip() else []
+
+    sections = []
+    if text[: matches[0].start()].strip():
+        sections.append(("header", text[: matches[0].start()]))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+        body = text[match.end() : end]
+        if body.strip():
+            sections.append((match.lastgroup, body))
+    return sections
+
+
+def split_token_windows(text, tokenizer, max_tokens=254, stride=32):
+    """Splits text into windows of at most max_tokens model tokens.
+
+    Consecutive windows overlap by stride tokens so no sentence is cut off
+    from all of its context. Windows are slices of the original text.
+    """
+    encoding = tokenizer(
+        text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+    )
+    offsets = encoding["offset_mapping"]
+    if len(offsets) <= max_tokens:
+        return [text] if text.strip() else []
+
+    step = max(max_tokens - stride, 1)
+    windows = []
+    for start in range(0, len(offsets), step):
+        end = min(start + max_tokens, len(offsets))
+        windows.append(text[offsets[start][0] : offsets[end - 1][1]])
+        if end == len(offsets):
+            break
+    return windows
+
+
+def chunk_document(model, text, mode="window", stride=32):
+    """Splits text into chunks that each fit the model's max sequence length."""
+    if mode not in CHUNKING_MODES:
+        raise ValueError(f"Unknown chunking mode {mode!r}, expected {CHUNKING_MODES}")
+
+    # Leave room for the [CLS] and [SEP] tokens
+    max_tokens = model.max_seq_length - 2
+    parts = split_sections(text) if mode == "section" else [("document", text)]
+
+    chunks = []
+    for _, part in parts:
+        chunks.extend(split_token_windows(part, model.tokenizer, max_tokens, stride))
+    return chunks or [text]
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def pooled_similarity(resume_embeddings, jd_embeddings, pooling="mean"):
+    """Cosine similarity between two documents given their chunk embeddings.
+
+    mean and max pool each document's chunks into one vector first; maxsim
+    matches every JD chunk to its closest resume chunk and averages those.
+    """
+    if pooling not in POOLING_MODES:
+        raise ValueError(f"Unknown pooling {pooling!r}, expected {POOLING_MODES}")
+
+    resume_embeddings = _normalize(resume_embeddings)
+    jd_embeddings = _normalize(jd_embeddings)
+    if pooling == "maxsim":
+        similarities = jd_embeddings @ resume_embeddings.T
+        return float(similarities.max(axis=1).mean())
+
+    pool = np.mean if pooling == "mean" else np.max
+    resume_vector = _normalize(pool(resume_embeddings, axis=0))
+    jd_vector = _normalize(pool(jd_embeddings, axis=0))
+    return float(resume_vector @ jd_vector)
+
+
+def chunked_semantic_score(
+    model,
+    processed_resume,
+    processed_job_desc,
+    mode="window",
+    pooling="mean",
+    cache=None,
+):
+    """Semantic score over the whole of both documents.
+
+    All chunks of both documents are encoded in a single batched call, so
+    cost grows linearly with document length.
+    """
+    resume_chunks = chunk_document(model, processed_resume, mode)
+    jd_chunks = chunk_document(model, processed_job_desc, mode)
+    embeddings = encode_cached(model, resume_chunks + jd_chunks, cache=cache)
+    return pooled_similarity(
+        embeddings[: len(resume_chunks)], embeddings[len(resume_chunks) :], pooling
+    )
@@ -1,3 +1,5 @@
+from scripts.keyword_matcher import KeywordMatcher
+
 # General skills list covering multiple domains
 GENERAL_SKILLS = {
     "programming_languages": [
@@ -252,5 +254,28 @@ TOOL_SYNONYMS = {
     "css": ["cascading style sheets"],
 }
 
-# Experience-based regex to match experience (years)
-EXPERIENCE_REGEX = r"\b(\d+)\s*years?\b|\b(\d+\.\d+)\s*years?\b"
+# Experience-based regex to match experience (years). A range such as
+# "3-5 years" captures its lower bound, and ages such as "5 years ago" or
+# "20 years old" are excluded.
+EXPERIENCE_REGEX = (
+    r"\b(?:(?P<low>\d+(?:\.\d+)?)\s*(?:-|–|to)\s*)?"
+    r"(?P<years>\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\b"
+    r"(?!\s+(?:ago|old|of\s+(?:history|legacy|heritage)|in\s+business))"
+)
+
+# Category names for the non-skill vocabularies in KEYWORD_MATCHER
+EDUCATION_CATEGORY = "education"
+JOB_ROLES_CATEGORY = "job_roles"
+TOOL_SYNONYMS_CATEGORY = "tool_synonyms"
+
+# Precompiled matcher over every vocabulary above, built once at import
+KEYWORD_MATCHER = KeywordMatcher(
+    {
+        **GENERAL_SKILLS,
+        EDUCATION_CATEGORY: EDUCATION_KEYWORDS,
+        JOB_ROLES_CATEGORY: JOB_ROLES,
+        TOOL_SYNONYMS_CATEGORY: [
+            synonym for synonyms in TOOL_SYNONYMS.values() for synonym in synonyms
+        ],
+    }
+)
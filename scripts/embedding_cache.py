@@ -0,0 +1,200 @@
+from scripts.text_processing import PREPROCESS_VERSION
+from scripts.metrics import timer, increment
+from collections import OrderedDict
+import numpy as np
+import threading
+import hashlib
+import sqlite3
+import os
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "embeddings.sqlite",
+)
+
+
+def model_cache_name(model):
+    """Returns the name used to key a model's embeddings in the cache.
+
+    load_sentence_model sets cache_name. Other SentenceTransformers are
+    named after the checkpoint they were loaded from and their embedding
+    dimension; a model with neither raises ValueError, since sharing a
+    name would hand it another model's vectors.
+    """
+    name = getattr(model, "cache_name", None)
+    if name:
+        return name
+    try:
+        source = model._first_module().auto_model.config._name_or_path
+        # Renamed in newer sentence-transformers releases
+        dimension = getattr(model, "get_embedding_dimension", None)
+        dim = (dimension or model.get_sentence_embedding_dimension)()
+    except (AttributeError, IndexError, KeyError, TypeError):
+        source = None
+    if not source:
+        raise ValueError(
+            f"Cannot name the embeddings of {type(model).__name__} for the "
+            "cache; set model.cache_name"
+        )
+    return f"{source}:{dim}"
+
+
+def embedding_key(model_name, text):
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+class EmbeddingCache:
+    """LRU embedding store in memory, optionally backed by a SQLite file.
+
+    Keys are the model name plus a SHA-256 of the preprocessed text, so a
+    document is encoded at most once per model no matter how often it is
+    matched. A SQLite file written by another PREPROCESS_VERSION is
+    emptied on open, since none of its texts can match again.
+    """
+
+    def __init__(self, path=None, max_items=2048):
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._check_version()
+            self._db.commit()
+
+    def _check_version(self):
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE name = 'preprocess_version'"
+        ).fetchone()
+        version = int(row[0]) if row else 1
+        if version != PREPROCESS_VERSION:
+            stale = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if stale:
+                print(
+                    f"Embedding cache: dropping {stale} embeddings of text "
+                    f"preprocessed by version {version}, now {PREPROCESS_VERSION}"
+                )
+                self._db.execute("DELETE FROM embeddings")
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (name, value) "
+                "VALUES ('preprocess_version', ?)",
+                (str(PREPROCESS_VERSION),),
+            )
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, key, vector):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    found[key] = self._memory[key]
+                else:
+                    missing.append(key)
+
+            if self._db is not None and missing:
+                placeholders = ",".join("?" * len(missing))
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    missing,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = np.frombuffer(blob, dtype=np.float32)
+                    self._remember(key, vector)
+                    found[key] = vector
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            for key, vector in items.items():
+                self._remember(key, np.asarray(vector, dtype=np.float32))
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, np.asarray(vector, dtype=np.float32).tobytes())
+                        for key, vector in items.items()
+                    ],
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache():
+    """Process-wide cache. Set SAMARTH_EMBEDDING_CACHE to a path, or to "off"
+    to keep embeddings in memory only."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            path = os.getenv("SAMARTH_EMBEDDING_CACHE", DEFAULT_CACHE_PATH)
+            if path.lower() in ("", "off", "none", "0"):
+                path = None
+            try:
+                _default_cache = EmbeddingCache(path)
+            except sqlite3.Error as e:
+                print(f"Embedding cache error: {e}")
+                _default_cache = EmbeddingCache()
+    return _default_cache
+
+
+def encode_cached(model, texts, cache=None, batch_size=64):
+    """Returns a float32 array with one embedding row per text.
+
+    Texts already in the cache are not re-encoded; the remaining unique
+    texts are encoded together in a single model.encode call.
+    """
+    if cache is None:
+        cache = get_default_cache()
+
+    model_name = model_cache_name(model)
+    keys = [embedding_key(model_name, text) for text in texts]
+    found = cache.get_many(set(keys))
+
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in pending:
+            pending[key] = text
+
+    increment("embedding_cache_hits", len(found))
+    increment("embedding_cache_misses", len(pending))
+    if pending:
+        with timer("model_encode"):
+            vectors = model.encode(
+                list(pending.values()), batch_size=batch_size, convert_to_numpy=True
+            )
+        encoded = dict(zip(pending.keys(), vectors.astype(np.float32)))
+        cache.put_many(encoded)
+        found.update(encoded)
+
+    if not keys:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.stack([found[key] for key in keys])
@@ -0,0 +1,287 @@
+"""Throughput-oriented wrapper around the SentenceTransformer.
+
+    python -m scripts.encoder --calibrate    # measure and save host settings
+
+Calibration writes .cache/encoder_tuning.json (or SAMARTH_ENCODER_TUNING),
+which AdaptiveEncoder and bulk ingestion read as their defaults.
+SAMARTH_INTRA_THREADS, SAMARTH_INTER_THREADS and SAMARTH_ENCODE_WORKERS
+override individual settings.
+"""
+
+import numpy as np
+import argparse
+import json
+import time
+import os
+
+DEFAULT_TUNING_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "encoder_tuning.json",
+)
+DEFAULT_TOKEN_BUDGET = 8192
+DEFAULT_MAX_BATCH_SIZE = 128
+# Rough characters per model token for English resumes and JDs
+CHARS_PER_TOKEN = 4
+
+_threads_configured = False
+
+
+def load_tuning(path=None):
+    """Saved calibration merged with the environment overrides."""
+    path = path or os.getenv("SAMARTH_ENCODER_TUNING", DEFAULT_TUNING_PATH)
+    tuning = {}
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                tuning = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Encoder tuning error: {e}")
+    for key, env in (
+        ("intra_threads", "SAMARTH_INTRA_THREADS"),
+        ("inter_threads", "SAMARTH_INTER_THREADS"),
+        ("workers", "SAMARTH_ENCODE_WORKERS"),
+    ):
+        if os.getenv(env):
+            tuning[key] = int(os.getenv(env))
+    return tuning
+
+
+def configure_threads(intra_threads=None, inter_threads=None):
+    """Sets torch's intra-op and inter-op thread pools.
+
+    torch only accepts the inter-op setting before any parallel work has
+    run, so it is applied once per process and skipped with a message
+    after that.
+    """
+    global _threads_configured
+    import torch
+
+    if intra_threads:
+        torch.set_num_threads(intra_threads)
+    if inter_threads and not _threads_configured:
+        try:
+            torch.set_num_interop_threads(inter_threads)
+        except RuntimeError as e:
+            print(f"Inter-op threads already fixed: {e}")
+    _threads_configured = True
+
+
+def thread_plan(workers=None, tuning=None):
+    """(workers, threads per worker) for a multi-process encoding job.
+
+    Without an explicit worker count the calibrated one is used, otherwise
+    one worker per core. The cores are split evenly so workers never
+    oversubscribe the machine.
+    """
+    cpus = os.cpu_count() or 1
+    if tuning is None:
+        tuning = load_tuning()
+    workers = workers or tuning.get("workers") or cpus
+    return workers, max(1, cpus // workers)
+
+
+def available_memory_bytes():
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _bytes_per_token(model):
+    # Peak inference activations of one transformer layer: the 4x wide
+    # feed-forward block plus one row of attention scores per head
+    try:
+        config = model[0].auto_model.config
+        hidden, heads = config.hidden_size, config.num_attention_heads
+    except (AttributeError, IndexError, KeyError, TypeError):
+        hidden, heads = 384, 12
+    return 4 * (8 * hidden + heads * model.max_seq_length)
+
+
+class AdaptiveEncoder:
+    """Encodes with length-sorted, token-budgeted batches.
+
+    Texts are sorted longest first and cut into batches whose padded size
+    stays under token_budget, so short texts are encoded in large batches
+    and long ones in small batches with little padding. The budget is also
+    capped so a batch uses at most memory_fraction of the available RAM.
+    Any other attribute is read from the wrapped model.
+    """
+
+    def __init__(
+        self,
+        model,
+        token_budget=None,
+        max_batch_size=None,
+        memory_fraction=0.25,
+        intra_threads=None,
+        inter_threads=None,
+        tuning=None,
+    ):
+        if tuning is None:
+            tuning = load_tuning()
+        self.model = model
+        self.token_budget = (
+            token_budget or tuning.get("token_budget") or DEFAULT_TOKEN_BUDGET
+        )
+        self.max_batch_size = (
+            max_batch_size or tuning.get("max_batch_size") or DEFAULT_MAX_BATCH_SIZE
+        )
+        memory = available_memory_bytes()
+        if memory:
+            memory_budget = int(memory * memory_fraction / _bytes_per_token(model))
+            self.token_budget = max(min(self.token_budget, memory_budget), 1)
+
+        intra_threads = intra_threads or tuning.get("intra_threads")
+        inter_threads = inter_threads or tuning.get("inter_threads")
+        if intra_threads or inter_threads:
+            configure_threads(intra_threads, inter_threads)
+
+    def __getattr__(self, name):
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def estimate_tokens(self, text):
+        return min(len(text) // CHARS_PER_TOKEN + 2, self.model.max_seq_length)
+
+    def plan_batches(self, texts, max_batch_size=None):
+        """Lists of input indices, longest texts first."""
+        max_batch_size = min(max_batch_size or self.max_batch_size, self.max_batch_size)
+        lengths = [self.estimate_tokens(text) for text in texts]
+        order = sorted(range(len(texts)), key=lengths.__getitem__, reverse=True)
+        batches = []
+        start = 0
+        while start < len(order):
+            # The first text is the longest, so it sets the padded length
+            size = self.token_budget // lengths[order[start]]
+            size = min(max(size, 1), max_batch_size)
+            batches.append(order[start : start + size])
+            start += size
+        return batches
+
+    def encode(self, sentences, batch_size=None, convert_to_numpy=True, **kwargs):
+        """Drop-in for model.encode returning numpy arrays.
+
+        batch_size, when given, caps the adaptive batch size.
+        """
+        if kwargs.get("convert_to_tensor") or not convert_to_numpy:
+            return self.model.encode(
+                sentences,
+                batch_size=batch_size or 32,
+                convert_to_numpy=convert_to_numpy,
+                **kwargs,
+            )
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size, **kwargs)[0]
+
+        texts = list(sentences)
+        # Renamed in newer sentence-transformers releases
+        dimension = getattr(self.model, "get_embedding_dimension", None)
+        dim = (dimension or self.model.get_sentence_embedding_dimension)()
+        embeddings = np.zeros((len(texts), dim), dtype=np.float32)
+        kwargs.setdefault("show_progress_bar", False)
+        for batch in self.plan_batches(texts, batch_size):
+            embeddings[batch] = self.model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+                **kwargs,
+            )
+        return embeddings
+
+
+def _throughput(encoder, texts, repeats):
+    encoder.encode(texts[: min(len(texts), 8)])
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        encoder.encode(texts)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return len(texts) / best
+
+
+def calibrate(model, texts, thread_counts=None, token_budgets=None, repeats=2):
+    """Measures docs/sec for each thread count and token budget.
+
+    The fastest setting becomes intra_threads and token_budget. The worker
+    count for bulk jobs comes from the thread count with the best docs/sec
+    per core, since that is how parallel workers scale.
+    """
+    import torch
+
+    cpus = os.cpu_count() or 1
+    if thread_counts is None:
+        thread_counts = sorted({1, cpus, *(2**i for i in range(cpus.bit_length()))})
+        thread_counts = [count for count in thread_counts if count <= cpus]
+    token_budgets = token_budgets or (2048, 4096, 8192, 16384, 32768)
+
+    original_threads = torch.get_num_threads()
+    results = []
+    try:
+        for threads in thread_counts:
+            torch.set_num_threads(threads)
+            for budget in token_budgets:
+                encoder = AdaptiveEncoder(model, token_budget=budget, tuning={})
+                docs_per_second = _throughput(encoder, texts, repeats)
+                results.append(
+                    {
+                        "intra_threads": threads,
+                        "token_budget": encoder.token_budget,
+                        "docs_per_sec": round(docs_per_second, 2),
+                    }
+                )
+                print(json.dumps(results[-1]))
+    finally:
+        torch.set_num_threads(original_threads)
+
+    fastest = max(results, key=lambda r: r["docs_per_sec"])
+    most_efficient = max(results, key=lambda r: r["docs_per_sec"] / r["intra_threads"])
+    return {
+        "intra_threads": fastest["intra_threads"],
+        "inter_threads": 1,
+        "token_budget": fastest["token_budget"],
+        "max_batch_size": DEFAULT_MAX_BATCH_SIZE,
+        "workers": max(1, cpus // most_efficient["intra_threads"]),
+        "docs_per_sec": fastest["docs_per_sec"],
+        "cpus": cpus,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encoder tuning")
+    parser.add_argument("--calibrate", action="store_true", required=True)
+    parser.add_argument("--texts", type=int, default=256, help="synthetic documents")
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument(
+        "--output", default=os.getenv("SAMARTH_ENCODER_TUNING", DEFAULT_TUNING_PATH)
+    )
+    args = parser.parse_args(argv)
+
+    from scripts.model_loader import load_sentence_model
+    from benchmarks.bench_pipeline import make_corpus
+
+    model = load_sentence_model()
+    resumes, jds = make_corpus(args.texts, max(1, args.texts // 8))
+    tuning = calibrate(model, resumes + jds, repeats=args.repeats)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(tuning, f, indent=2)
+    summary = {key: value for key, value in tuning.items() if key != "results"}
+    print(json.dumps(summary, indent=2))
+    print(f"Saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+from scripts.constants import EXPERIENCE_REGEX
+from scripts.chunking import SECTION_PATTERNS, SECTION_REGEX
+from datetime import date
+import re
+
+MONTHS = {
+    "jan": 1,
+    "feb": 2,
+    "mar": 3,
+    "apr": 4,
+    "may": 5,
+    "jun": 6,
+    "jul": 7,
+    "aug": 8,
+    "sep": 9,
+    "oct": 10,
+    "nov": 11,
+    "dec": 12,
+}
+MONTH_PATTERN = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+)
+ONGOING = ("present", "current", "now", "today", "date", "till date")
+# Date ranges in these sections are study or side projects, not employment
+SKIPPED_SECTIONS = ("education", "projects", "certifications")
+MAX_STATED_YEARS = 40
+FIRST_YEAR = 1950
+
+# "established over 30 years", "founded in 1998 - 2005": the age of the
+# company, when one of these words is at most three words before the number
+_COMPANY_CONTEXT = re.compile(
+    r"\b(?:founded|established|incorporated|legacy|heritage)\b(?:\W+\w+){0,3}\W*$"
+)
+# Outside an Experience section a range only counts next to a job title or
+# an employer, so "volunteer 2010 - 2020" in a summary is not a job
+_WORK_CONTEXT = re.compile(
+    r"\b(?:engineer|developer|programmer|analyst|scientist|researcher|manager"
+    r"|consultant|intern(?:ship)?|architect|designer|administrator|specialist"
+    r"|associate|lead|director|officer|executive|writer|strategist"
+    r"|inc|ltd|llc|llp|pvt|corp(?:oration)?|limited|technologies|solutions|labs)\b"
+)
+
+
+# "2015 - 2019" on the same line as a degree or institute is a course, even
+# when the resume has no Education heading
+_EDUCATION_CONTEXT = re.compile(
+    r"\b(?:b\.?\s?tech|m\.?\s?tech|b\.?\s?sc|m\.?\s?sc|b\.(?:e|a|com)|m\.(?:e|s|a|com)"
+    r"|bachelor|master(?:'?s|\s+of)|mba|ph\.?\s?d|diploma|degree|c?gpa|iiit|iit|nit)\b"
+)
+# A year straight after another number ("+91 98100 2019-2021") is part of
+# a phone number or ID, not the start of a date range
+_AFTER_NUMBER = re.compile(r"\d[)\]]?[^\S\n]*[-./]?[^\S\n]*$")
+
+MONTH_PREFIX = rf"(?:(?P<month>{MONTH_PATTERN})\.?,?\s*|(?P<mm>0?[1-9]|1[0-2])\s*/\s*)"
+
+# Headings, date ranges and stated durations, matched in one pass. Apart
+# from headings every match starts at a digit, which the leading lookahead
+# checks before trying the alternatives; a range therefore starts at its
+# first year and the month before it is read by _START_MONTH.
+EXPERIENCE_SCANNER = re.compile(
+    r"(?=\d|^)(?:^[^\S\n]*(?P<heading>"
+    + "|".join(SECTION_PATTERNS.values())
+    + r")[^\S\n]*:?[^\S\n]*$"
+    + r"|\b(?P<year_start>(?:19|20)\d\d)\s*(?:-|–|—|to|till|until)\s*"
+    + r"(?:(?P<ongoing>"
+    + "|".join(ONGOING[::-1])
+    + r")\b|"
+    + MONTH_PREFIX.replace("<month>", "<month_end>").replace("<mm>", "<mm_end>")
+    + r"?(?P<year_end>(?:19|20)\d\d)\b)"
+    + r"|"
+    + EXPERIENCE_REGEX
+    + r")",
+    re.MULTILINE,
+)
+_START_MONTH = re.compile(r"\b" + MONTH_PREFIX + r"$")
+
+
+def _month_index(year, month_name=None, mm=None, end=False):
+    if month_name:
+        month = MONTHS[month_name[:3]]
+    elif mm:
+        month = int(mm)
+    else:
+        # A bare year starts in January; "2019 - 2021" is two years
+        return int(year) * 12
+    # Months are inclusive, so "jan 2020 - jan 2020" is one month
+    return int(year) * 12 + month - 1 + (1 if end else 0)
+
+
+def _merged_months(intervals):
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def experience_breakdown(text, today=None):
+    """Stated years, employment date ranges and the combined estimate.
+
+    Stated years come from phrases like "5+ years of experience", ignoring
+    ages such as "founded 20 years ago". Ranges like "Jan 2019 - Present"
+    are counted under an Experience heading, or elsewhere when the line or
+    the one above names a role or employer; degree lines, phone numbers and
+    company ages are skipped. The ranges are merged, so overlapping jobs
+    are counted once. years is the larger of the two estimates.
+    """
+    today = today or date.today()
+    now = today.year * 12 + today.month
+    stated = 0.0
+    intervals = []
+    section = None
+    text = text.lower()
+    for match in EXPERIENCE_SCANNER.finditer(text):
+        if match.group("heading"):
+            section = SECTION_REGEX.match(match.group()).lastgroup
+        elif match.group("year_start"):
+            if section in SKIPPED_SECTIONS:
+                continue
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.end())
+            line_end = line_end if line_end >= 0 else len(text)
+            if _EDUCATION_CONTEXT.search(text, line_start, line_end):
+                continue
+            prefix = _START_MONTH.search(
+                text, max(match.start() - 16, 0), match.start()
+            )
+            range_start = prefix.start() if prefix else match.start()
+            # "15 jan 2019" is a day, so only check bare and numeric months
+            if not (prefix and prefix.group("month")) and _AFTER_NUMBER.search(
+                text, line_start, range_start
+            ):
+                continue
+            context_start = max(line_start, range_start - 60)
+            if _COMPANY_CONTEXT.search(text, context_start, range_start):
+                continue
+            if section != "experience":
+                # The title is often on the line above the dates
+                previous_line = (
+                    text.rfind("\n", 0, line_start - 1) + 1 if line_start else 0
+                )
+                if not _WORK_CONTEXT.search(text, previous_line, line_end):
+                    continue
+            start = _month_index(
+                match.group("year_start"),
+                prefix and prefix.group("month"),
+                prefix and prefix.group("mm"),
+            )
+            if match.group("ongoing"):
+                end = now
+            else:
+                end = _month_index(
+                    match.group("year_end"),
+                    match.group("month_end"),
+                    match.group("mm_end"),
+                    end=True,
+                )
+            end = min(end, now)
+            if FIRST_YEAR * 12 <= start < end:
+                intervals.append((start, end))
+        else:
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            context_start = max(line_start, match.start() - 60)
+            if _COMPANY_CONTEXT.search(text, context_start, match.start()):
+                continue
+            years = float(match.group("low") or match.group("years"))
+            if years < MAX_STATED_YEARS:
+                stated = max(stated, years)
+
+    employment = round(_merged_months(intervals) / 12, 1)
+    return {
+        "stated_years": stated,
+        "employment_years": employment,
+        "intervals": intervals,
+        "years": max(stated, employment),
+    }
+
+
+def extract_years_of_experience(text):
+    return experience_breakdown(text)["years"]
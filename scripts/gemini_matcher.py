@@ -1,35 +1,22 @@
+from scripts.metrics import timed, increment
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import threading
+import hashlib
+import asyncio
 import json
+import os
 import re
 
-try:
-    import streamlit as st
-    import google.generativeai as genai
+GEMINI_MODEL_NAME = "gemini-2.0-flash-lite-001"
 
-    try:
-        api_key = st.secrets["GEMINI_API_KEY"]
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.0-flash-lite-001")
-        GEMINI_AVAILABLE = True
-    except Exception as e:
-        print(f"Gemini config error: {e}")
-        GEMINI_AVAILABLE = False
-
-except ImportError as e:
-    print(f"Import error: {e}")
-    GEMINI_AVAILABLE = False
-
-
-def get_llm_feedback(resume_text: str, job_description: str) -> dict:
-    """Returns a relevance score and 3-point feedback from Gemini for resume matching."""
-    if not GEMINI_AVAILABLE:
-        return {
-            "score": 0,
-            "feedback": [
-                "❌ Gemini model is unavailable. Check API key or package installation."
-            ],
-        }
+# Limits on every call to the LLM backend, shared by all sessions
+REQUEST_TIMEOUT = float(os.getenv("SAMARTH_LLM_TIMEOUT", "30"))
+MAX_RETRIES = int(os.getenv("SAMARTH_LLM_RETRIES", "2"))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("SAMARTH_LLM_CONCURRENCY", "4"))
+CACHE_SIZE = 256
 
-    prompt = f"""
+PROMPT_TEMPLATE = """
 You are an AI resume evaluator.
 
 Given the following job description and resume, analyze how well the resume matches the job description.
@@ -53,22 +40,236 @@ Respond in valid JSON format (no markdown code block, no extra characters):
 }}
 """
 
-    try:
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
 
-        # Clean markdown formatting if present
-        if raw_text.startswith("```"):
-            raw_text = re.sub(
-                r"^```(?:json)?\s*|\s*```$", "", raw_text.strip(), flags=re.IGNORECASE
+class GeminiBackend:
+    """Google Gemini, configured on first use rather than at import."""
+
+    name = GEMINI_MODEL_NAME
+
+    def __init__(self, model_name=GEMINI_MODEL_NAME):
+        self.name = model_name
+        self._model = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _configure(self):
+        with self._lock:
+            if self._model is not None or self._error is not None:
+                return
+            try:
+                import google.generativeai as genai
+
+                api_key = os.getenv("GEMINI_API_KEY")
+                if not api_key:
+                    import streamlit as st
+
+                    api_key = st.secrets["GEMINI_API_KEY"]
+                genai.configure(api_key=api_key)
+                self._model = genai.GenerativeModel(self.name)
+            except Exception as e:
+                print(f"Gemini config error: {e}")
+                self._error = e
+
+    @property
+    def available(self):
+        self._configure()
+        return self._model is not None
+
+    def generate(self, prompt, timeout=None):
+        self._configure()
+        if self._model is None:
+            raise RuntimeError(f"Gemini is unavailable: {self._error}")
+        # Without a client-side timeout an abandoned call keeps its thread
+        # and request slot until the API gives up
+        request_options = {"timeout": timeout} if timeout else None
+        return self._model.generate_content(
+            prompt, request_options=request_options
+        ).text
+
+
+class StubBackend:
+    """Offline stand-in for tests and benchmarks.
+
+    Scores by word overlap between the JD and resume sections of the prompt
+    and can simulate network latency with delay (seconds). failures makes
+    the first calls raise, and reply replaces the JSON response.
+    """
+
+    name = "stub"
+    available = True
+
+    def __init__(self, delay=0.0, failures=0, reply=None):
+        self.delay = delay
+        self.failures = failures
+        self.reply = reply
+        self.calls = 0
+        self.timeouts = []
+
+    def generate(self, prompt, timeout=None):
+        self.calls += 1
+        self.timeouts.append(timeout)
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if self.calls <= self.failures:
+            raise ConnectionError(f"Simulated failure {self.calls}")
+        if self.reply is not None:
+            return self.reply
+        jd_part, _, resume_part = prompt.partition("Resume:")
+        jd_words = set(jd_part.partition("Job Description:")[2].lower().split())
+        resume_words = set(resume_part.partition("Respond in")[0].lower().split())
+        score = round(100 * len(jd_words & resume_words) / max(len(jd_words), 1))
+        return json.dumps(
+            {
+                "score": score,
+                "feedback": [
+                    f"{len(jd_words & resume_words)} job description terms found",
+                    f"{len(jd_words - resume_words)} job description terms missing",
+                    "Generated by the offline stub backend",
+                ],
+            }
+        )
+
+
+_backend = None
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+_executor = ThreadPoolExecutor(MAX_CONCURRENT_REQUESTS, thread_name_prefix="llm")
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = GeminiBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """Replaces the LLM backend, e.g. with StubBackend() in tests."""
+    global _backend
+    _backend = backend
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def build_prompt(resume_text, job_description):
+    return PROMPT_TEMPLATE.format(
+        resume_text=resume_text, job_description=job_description
+    )
+
+
+def parse_response(raw_text):
+    raw_text = raw_text.strip()
+
+    # Clean markdown formatting if present
+    if raw_text.startswith("```"):
+        raw_text = re.sub(
+            r"^```(?:json)?\s*|\s*```$", "", raw_text.strip(), flags=re.IGNORECASE
+        )
+
+    parsed = json.loads(raw_text)
+
+    # Ensure feedback has at most 3 points
+    parsed["feedback"] = parsed.get("feedback", [])[:3]
+
+    return parsed
+
+
+def _cache_key(backend, resume_text, job_description):
+    payload = "\0".join([backend.name, resume_text, job_description])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cached(key):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return dict(_cache[key])
+    return None
+
+
+def _store(key, value):
+    with _cache_lock:
+        _cache[key] = dict(value)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def _generate_limited(backend, prompt, timeout):
+    with _request_slots:
+        return backend.generate(prompt, timeout=timeout)
+
+
+@timed("llm_feedback")
+async def get_llm_feedback_async(
+    resume_text: str,
+    job_description: str,
+    backend=None,
+    timeout: float = REQUEST_TIMEOUT,
+    retries: int = MAX_RETRIES,
+) -> dict:
+    """Async version of get_llm_feedback with timeout, retries and caching.
+
+    Successful responses are cached by a hash of the backend, resume and JD,
+    so repeating the same request never calls the API again. Failed and
+    timed out calls are retried; a reply that is not valid JSON is not.
+    """
+    backend = backend or get_backend()
+    if not backend.available:
+        return {
+            "score": 0,
+            "feedback": [
+                "❌ Gemini model is unavailable. Check API key or package installation."
+            ],
+        }
+
+    key = _cache_key(backend, resume_text, job_description)
+    cached = _cached(key)
+    if cached is not None:
+        increment("llm_cache_hits")
+        return cached
+
+    increment("llm_requests")
+    prompt = build_prompt(resume_text, job_description)
+    error = None
+    for attempt in range(retries + 1):
+        try:
+            raw_text = await asyncio.wait_for(
+                asyncio.to_thread(_generate_limited, backend, prompt, timeout),
+                timeout,
             )
+            break
+        except asyncio.TimeoutError:
+            error = f"timed out after {timeout}s"
+        except Exception as e:
+            error = str(e)
+        if attempt < retries:
+            await asyncio.sleep(0.5 * 2**attempt)
+    else:
+        return {"score": 0, "feedback": [f"❌ Gemini error: {error}"]}
+
+    try:
+        parsed = parse_response(raw_text)
+    except (ValueError, AttributeError, TypeError) as e:
+        return {"score": 0, "feedback": [f"❌ Gemini returned invalid JSON: {e}"]}
+    _store(key, parsed)
+    return parsed
 
-        parsed = json.loads(raw_text)
 
-        # Ensure feedback has at most 3 points
-        parsed["feedback"] = parsed.get("feedback", [])[:3]
+def get_llm_feedback(resume_text: str, job_description: str, backend=None) -> dict:
+    """Returns a relevance score and 3-point feedback from Gemini for resume matching."""
+    backend = backend or get_backend()
+    if backend.available:
+        cached = _cached(_cache_key(backend, resume_text, job_description))
+        if cached is not None:
+            return cached
+    return asyncio.run(get_llm_feedback_async(resume_text, job_description, backend))
 
-        return parsed
 
-    except Exception as e:
-        return {"score": 0, "feedback": [f"❌ Gemini error: {str(e)}"]}
+def submit_llm_feedback(resume_text: str, job_description: str, backend=None):
+    """Runs get_llm_feedback in a background thread and returns its Future,
+    so the Streamlit page can keep rendering while Gemini answers."""
+    return _executor.submit(get_llm_feedback, resume_text, job_description, backend)
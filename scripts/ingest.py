@@ -0,0 +1,283 @@
+"""Bulk resume ingestion: PDFs from a folder or zip archive to JSONL/Parquet.
+
+    python -m scripts.ingest resumes/ --output resumes.jsonl --workers 4
+    python -m scripts.ingest resumes.zip --output resumes.parquet --format parquet
+
+Each worker process loads the model once. Records are written as soon as a
+chunk finishes, so an interrupted run resumes where it stopped when it is
+started again with the same output path. Rows of documents that failed
+are removed from the output when a run starts, and those documents are
+tried again, so every id appears once.
+"""
+
+from scripts.structured_parser import parse_document
+from scripts.resume_parser import extract_text_from_pdf
+from scripts.text_processing import MODES, preprocess_text
+from scripts.encoder import configure_threads, thread_plan
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import hashlib
+import zipfile
+import json
+import glob
+import time
+import os
+
+_worker_model = None
+
+
+def find_documents(source):
+    """Returns (doc_id, location) pairs for every PDF under source.
+
+    location is a path, or a (zip_path, member) pair for archive members.
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            members = sorted(
+                name for name in archive.namelist() if name.lower().endswith(".pdf")
+            )
+        return [
+            (f"{os.path.basename(source)}:{name}", (source, name)) for name in members
+        ]
+
+    paths = glob.glob(os.path.join(source, "**", "*.pdf"), recursive=True)
+    paths += glob.glob(os.path.join(source, "**", "*.PDF"), recursive=True)
+    return [(os.path.relpath(path, source), path) for path in sorted(set(paths))]
+
+
+def _read(location):
+    if isinstance(location, tuple):
+        zip_path, member = location
+        with zipfile.ZipFile(zip_path) as archive:
+            return archive.read(member)
+    with open(location, "rb") as f:
+        return f.read()
+
+
+def _init_worker(embed, threads):
+    global _worker_model
+    if embed:
+        from scripts.registry import get_model
+
+        _worker_model = get_model()
+        if _worker_model is None:
+            # Failing the initializer stops the pool instead of silently
+            # writing records without embeddings
+            raise RuntimeError("Sentence model could not be loaded")
+        # Split the cores between workers instead of every worker using all
+        configure_threads(threads, 1)
+
+
+def _process_chunk(chunk, preprocess_mode=None):
+    records = []
+    for doc_id, location in chunk:
+        record = {"id": doc_id}
+        try:
+            data = _read(location)
+            record["sha256"] = hashlib.sha256(data).hexdigest()
+            text = extract_text_from_pdf(data)
+            processed = preprocess_text(text, preprocess_mode)
+            record["chars"] = len(text)
+            record.update(parse_document(text).to_dict())
+            record["text"] = processed
+            record["error"] = None
+        except Exception as e:
+            record["error"] = str(e)
+        records.append(record)
+
+    if _worker_model is not None:
+        ok = [record for record in records if record["error"] is None]
+        if ok:
+            vectors = _worker_model.encode(
+                [record["text"] for record in ok], convert_to_numpy=True
+            )
+            for record, vector in zip(ok, vectors):
+                record["embedding"] = vector.astype("float32").tolist()
+    return records
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.path = path
+
+    def drop_failed(self):
+        """Rewrites the file without error rows and lines cut off by a crash."""
+        if not os.path.exists(self.path):
+            return 0
+        kept = []
+        dropped = 0
+        with open(self.path) as f:
+            for line in f:
+                try:
+                    if line.endswith("\n") and not json.loads(line).get("error"):
+                        kept.append(line)
+                        continue
+                except ValueError:
+                    pass
+                dropped += 1
+        if dropped:
+            with open(self.path + ".tmp", "w") as f:
+                f.writelines(kept)
+            os.replace(self.path + ".tmp", self.path)
+        return dropped
+
+    def done_ids(self):
+        done = set()
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        if not record.get("error"):
+                            done.add(record["id"])
+                    except (ValueError, KeyError):
+                        # A line cut off by a crash is simply redone
+                        continue
+        return done
+
+    def write(self, records):
+        with open(self.path, "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class ParquetWriter:
+    """Writes one Parquet part file per chunk into the output directory."""
+
+    def __init__(self, path):
+        import pyarrow  # noqa: F401  fail early when pyarrow is missing
+
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def drop_failed(self):
+        """Rewrites part files without their error rows."""
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        dropped = 0
+        for part in glob.glob(os.path.join(self.path, "part-*.parquet")):
+            table = pq.read_table(part)
+            kept = table.filter(pc.is_null(table["error"]))
+            if len(kept) == len(table):
+                continue
+            dropped += len(table) - len(kept)
+            if len(kept):
+                pq.write_table(kept, part + ".tmp")
+                os.replace(part + ".tmp", part)
+            else:
+                os.remove(part)
+        return dropped
+
+    def done_ids(self):
+        import pyarrow.parquet as pq
+
+        done = set()
+        for part in glob.glob(os.path.join(self.path, "part-*.parquet")):
+            table = pq.read_table(part, columns=["id", "error"]).to_pydict()
+            done.update(
+                doc_id
+                for doc_id, error in zip(table["id"], table["error"])
+                if not error
+            )
+        return done
+
+    def write(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        part = os.path.join(self.path, f"part-{time.time_ns()}.parquet")
+        # Every part shares one schema, even when a chunk only has errors
+        # or was written without embeddings
+        schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("sha256", pa.string()),
+                ("chars", pa.int64()),
+                ("email", pa.string()),
+                ("phone", pa.string()),
+                ("skills", pa.list_(pa.string())),
+                ("education", pa.list_(pa.string())),
+                ("roles", pa.list_(pa.string())),
+                ("years_experience", pa.float64()),
+                ("text", pa.string()),
+                ("error", pa.string()),
+                ("embedding", pa.list_(pa.float32())),
+            ]
+        )
+        pq.write_table(pa.Table.from_pylist(records, schema=schema), part + ".tmp")
+        os.replace(part + ".tmp", part)
+
+
+def ingest(
+    source,
+    output,
+    output_format="jsonl",
+    workers=None,
+    chunk_size=16,
+    embed=True,
+    preprocess_mode=None,
+):
+    writer = (
+        ParquetWriter(output) if output_format == "parquet" else JsonlWriter(output)
+    )
+    documents = find_documents(source)
+    writer.drop_failed()
+    done = writer.done_ids()
+    pending = [doc for doc in documents if doc[0] not in done]
+    print(f"{len(documents)} PDFs found, {len(done)} already ingested")
+    if not pending:
+        return 0
+
+    workers, threads = thread_plan(workers)
+    chunks = [pending[i : i + chunk_size] for i in range(0, len(pending), chunk_size)]
+
+    start_time = time.perf_counter()
+    processed = failed = 0
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(embed, threads)
+    ) as executor:
+        futures = [
+            executor.submit(_process_chunk, chunk, preprocess_mode) for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            records = future.result()
+            writer.write(records)
+            processed += len(records)
+            failed += sum(1 for record in records if record["error"])
+            elapsed = time.perf_counter() - start_time
+            print(
+                f"{processed}/{len(pending)} docs, {failed} failed, "
+                f"{processed / elapsed:.1f} docs/sec"
+            )
+    return processed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk resume ingestion")
+    parser.add_argument("source", help="folder of PDFs or a zip archive")
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--no-embed", action="store_true", help="skip embeddings")
+    parser.add_argument(
+        "--preprocess", choices=MODES, default=None, help="tokenizer (default treebank)"
+    )
+    args = parser.parse_args(argv)
+
+    ingest(
+        args.source,
+        args.output,
+        args.format,
+        args.workers,
+        args.chunk_size,
+        embed=not args.no_embed,
+        preprocess_mode=args.preprocess,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,642 @@
+"""Job description fetching: concurrent HTTP with revalidation, HTML to text.
+
+    python -m scripts.jd_fetch URL [URL ...] --output jds.jsonl
+    python -m scripts.jd_fetch URL --fixtures saved_pages/   # no network
+
+Pages are fetched through a pluggable transport (HttpTransport over a
+pooled httpx client, or FileTransport over saved HTML files), limited per
+host, and revalidated with ETag / Last-Modified so an unchanged posting
+is neither downloaded nor parsed again.
+
+URLs come from users, so HttpTransport only connects to public addresses:
+http(s) only, every host (including redirect targets) is resolved and
+rejected when it is loopback, private, link-local or otherwise not
+globally routable, and responses are capped at SAMARTH_JD_MAX_BYTES.
+"""
+
+from scripts.text_processing import preprocess_text
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from email.utils import formatdate, parsedate_to_datetime
+from html.parser import HTMLParser
+from html import unescape
+from urllib.parse import urljoin, urlsplit, urlunsplit, unquote
+from typing import Optional
+import ipaddress
+import threading
+import argparse
+import hashlib
+import asyncio
+import sqlite3
+import socket
+import json
+import time
+import os
+import re
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "jd_http.sqlite",
+)
+REQUEST_TIMEOUT = float(os.getenv("SAMARTH_JD_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("SAMARTH_JD_RETRIES", "2"))
+MAX_CONCURRENCY = int(os.getenv("SAMARTH_JD_CONCURRENCY", "32"))
+PER_HOST_LIMIT = int(os.getenv("SAMARTH_JD_PER_HOST", "4"))
+MAX_RESPONSE_BYTES = int(os.getenv("SAMARTH_JD_MAX_BYTES", str(2 * 2**20)))
+MAX_REDIRECTS = 5
+USER_AGENT = "Mozilla/5.0 (compatible; SamarthResumeMatcher/1.0)"
+
+
+class FetchError(Exception):
+    """A fetch that failed for good; it is not retried."""
+
+
+class UnsafeURLError(FetchError, ValueError):
+    """The URL is not http(s) or resolves to a non-public address."""
+
+
+class TransientFetchError(FetchError):
+    """A network failure (connection, timeout) worth retrying."""
+
+
+def resolve_public_address(url, allow_private=False):
+    """Resolves url's host and returns (scheme, host, port, ip_address).
+
+    Raises UnsafeURLError for other schemes and for hosts that resolve to
+    any loopback, private, link-local, reserved or otherwise non-global
+    address, unless allow_private is set (for local fixture servers).
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        raise UnsafeURLError(f"Only http and https URLs are supported: {url!r}")
+    if not parts.hostname:
+        raise UnsafeURLError(f"URL has no host: {url!r}")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        raise UnsafeURLError(f"Invalid port in URL: {url!r}") from None
+
+    try:
+        infos = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as e:
+        raise FetchError(f"Could not resolve {parts.hostname}: {e}") from None
+    addresses = []
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        mapped = getattr(address, "ipv4_mapped", None)
+        if not allow_private and not (mapped or address).is_global:
+            raise UnsafeURLError(
+                f"{parts.hostname} resolves to a non-public address ({address})"
+            )
+        addresses.append(address)
+    if not addresses:
+        raise FetchError(f"Could not resolve {parts.hostname}")
+    return parts.scheme, parts.hostname, port, addresses[0]
+
+
+@dataclass(frozen=True, slots=True)
+class FetchResponse:
+    """A transport's reply. headers keys are lowercase."""
+
+    url: str
+    status: int
+    headers: dict
+    body: bytes
+
+
+@dataclass(frozen=True, slots=True)
+class FetchedJD:
+    url: str
+    status: int
+    title: Optional[str]
+    text: str
+    from_cache: bool = False
+    error: Optional[str] = None
+
+    def preprocessed(self, mode=None):
+        return preprocess_text(self.text, mode)
+
+
+class HttpTransport:
+    """httpx.AsyncClient with pooled keep-alive connections.
+
+    Each request goes to the address checked by resolve_public_address,
+    with the Host header and TLS SNI set to the original host name, so a
+    DNS answer that changes between the check and the connection cannot
+    redirect it. Redirects are followed here, checking every hop.
+
+    The client is created on first use inside the running event loop and
+    must be closed with aclose() (or by using JDFetcher as a context
+    manager) before that loop ends.
+    """
+
+    def __init__(
+        self,
+        timeout=REQUEST_TIMEOUT,
+        max_connections=MAX_CONCURRENCY,
+        max_bytes=MAX_RESPONSE_BYTES,
+        allow_private=False,
+    ):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_bytes = max_bytes
+        self.allow_private = allow_private
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=False,
+                headers={"User-Agent": USER_AGENT},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def _get_once(self, url, headers):
+        import httpx
+
+        scheme, host, port, address = await asyncio.to_thread(
+            resolve_public_address, url, self.allow_private
+        )
+        parts = urlsplit(url)
+        ip_host = f"[{address}]" if address.version == 6 else str(address)
+        default_port = 443 if scheme == "https" else 80
+        netloc = ip_host if port == default_port else f"{ip_host}:{port}"
+        target = urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+        request_headers = {**headers, "Host": parts.netloc.rsplit("@", 1)[-1]}
+        extensions = {"sni_hostname": host} if scheme == "https" else {}
+
+        try:
+            async with self._get_client().stream(
+                "GET", target, headers=request_headers, extensions=extensions
+            ) as response:
+                response_headers = {
+                    key.lower(): value for key, value in response.headers.items()
+                }
+                if response.is_redirect:
+                    return FetchResponse(
+                        url, response.status_code, response_headers, b""
+                    )
+                declared = response_headers.get("content-length", "")
+                if declared.isdigit() and int(declared) > self.max_bytes:
+                    raise FetchError(f"Response larger than {self.max_bytes} bytes")
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FetchError(f"Response larger than {self.max_bytes} bytes")
+                    chunks.append(chunk)
+        except httpx.TransportError as e:
+            raise TransientFetchError(str(e) or type(e).__name__) from e
+        return FetchResponse(
+            url, response.status_code, response_headers, b"".join(chunks)
+        )
+
+    async def fetch(self, url, headers):
+        for _ in range(MAX_REDIRECTS + 1):
+            response = await self._get_once(url, headers)
+            location = response.headers.get("location")
+            if response.status not in (301, 302, 303, 307, 308) or not location:
+                return response
+            url = urljoin(url, location)
+            # Validators belong to the original URL, not the redirect target
+            headers = {}
+        raise FetchError(f"More than {MAX_REDIRECTS} redirects")
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FileTransport:
+    """Serves saved HTML files as if they were fetched over HTTP.
+
+    A URL is looked up in mapping, then as a file:// path, then under root
+    as root/<host>/<path>.html. ETag and Last-Modified come from the file,
+    and conditional requests get a 304, so caching behaves as it would
+    against a real server.
+    """
+
+    def __init__(self, root=None, mapping=None):
+        self.root = root
+        self.mapping = dict(mapping or {})
+
+    def path_for(self, url):
+        if url in self.mapping:
+            return self.mapping[url]
+        parts = urlsplit(url)
+        if parts.scheme == "file":
+            return unquote(parts.path)
+        if self.root:
+            path = unquote(parts.path).strip("/") or "index"
+            if not os.path.splitext(path)[1]:
+                path += ".html"
+            return os.path.join(self.root, parts.netloc, path)
+        return None
+
+    async def fetch(self, url, headers):
+        path = self.path_for(url)
+        if not path or not os.path.isfile(path):
+            return FetchResponse(url, 404, {}, b"")
+        with open(path, "rb") as f:
+            body = f.read()
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        modified = formatdate(os.path.getmtime(path), usegmt=True)
+        response_headers = {
+            "etag": etag,
+            "last-modified": modified,
+            "content-type": "text/html; charset=utf-8",
+        }
+        if headers.get("If-None-Match") == etag:
+            return FetchResponse(url, 304, response_headers, b"")
+        return FetchResponse(url, 200, response_headers, body)
+
+    async def aclose(self):
+        pass
+
+
+class JDHttpCache:
+    """Extracted JDs per URL with their ETag, Last-Modified and expiry.
+
+    In memory (LRU) and optionally in a SQLite file. Only the extracted
+    text is stored, so a 304 reply skips both the download and the HTML
+    parsing.
+    """
+
+    _COLUMNS = ("etag", "last_modified", "expires", "status", "title", "text")
+
+    def __init__(self, path=None, max_items=1024):
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS jd_http (url TEXT PRIMARY KEY, "
+                "etag TEXT, last_modified TEXT, expires REAL, status INTEGER, "
+                "title TEXT, text TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def _remember(self, url, entry):
+        self._memory[url] = entry
+        self._memory.move_to_end(url)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, url):
+        with self._lock:
+            entry = self._memory.get(url)
+            if entry is not None:
+                self._memory.move_to_end(url)
+                return entry
+            if self._db is None:
+                return None
+            row = self._db.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jd_http WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            entry = dict(zip(self._COLUMNS, row))
+            self._remember(url, entry)
+            return entry
+
+    def put(self, url, entry):
+        with self._lock:
+            self._remember(url, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO jd_http (url, "
+                    + ", ".join(self._COLUMNS)
+                    + ") VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url, *(entry[column] for column in self._COLUMNS)),
+                )
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM jd_http")
+                self._db.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_jd_cache():
+    """Process-wide cache. Set SAMARTH_JD_CACHE to a path, or to "off" to
+    keep fetched JDs in memory only."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            path = os.getenv("SAMARTH_JD_CACHE", DEFAULT_CACHE_PATH)
+            if path.lower() in ("", "off", "none", "0"):
+                path = None
+            try:
+                _default_cache = JDHttpCache(path)
+            except sqlite3.Error as e:
+                print(f"JD cache error: {e}")
+                _default_cache = JDHttpCache()
+    return _default_cache
+
+
+def _expiry(headers):
+    cache_control = headers.get("cache-control", "")
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        return None
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        return time.time() + int(max_age.group(1))
+    if "expires" in headers:
+        try:
+            return parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+SKIPPED_TAGS = frozenset(
+    ("script", "style", "noscript", "svg", "template", "nav", "footer", "iframe")
+)
+BLOCK_TAGS = frozenset(
+    (
+        "p",
+        "div",
+        "br",
+        "li",
+        "ul",
+        "ol",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "tr",
+        "table",
+        "section",
+        "article",
+        "header",
+        "dd",
+        "dt",
+        "blockquote",
+        "pre",
+    )
+)
+_SPACES = re.compile(r"[^\S\n]+")
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.title = None
+        self.json_ld = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._json_ld_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script" and ("type", "application/ld+json") in attrs:
+            self._json_ld_parts = []
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n- " if tag == "li" else "\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+            if tag == "script" and self._json_ld_parts is not None:
+                self.json_ld.append("".join(self._json_ld_parts))
+                self._json_ld_parts = None
+        elif tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+        elif self._in_title:
+            self.title = (self.title or "") + data
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def _clean(text):
+    lines = (_SPACES.sub(" ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line and line != "-")
+
+
+def html_to_text(html):
+    """Visible text of an HTML document, one block element per line."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return _clean("".join(parser.parts))
+
+
+def _job_postings(data):
+    if isinstance(data, list):
+        for item in data:
+            yield from _job_postings(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type")
+        if kind == "JobPosting" or (isinstance(kind, list) and "JobPosting" in kind):
+            yield data
+        yield from _job_postings(data.get("@graph", []))
+
+
+def extract_job_posting(html):
+    """Returns (title, text) for a job page.
+
+    Job boards such as LinkedIn, Naukri and Foundit embed the posting as
+    schema.org JobPosting JSON-LD, which is used when present since it is
+    free of navigation and ads. Otherwise the page's visible text is used.
+    """
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    for block in parser.json_ld:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for posting in _job_postings(data):
+            description = posting.get("description")
+            if description:
+                # Some boards escape the description's markup a second time
+                if "<" not in description and "&lt;" in description:
+                    description = unescape(description)
+                title = posting.get("title") or parser.title
+                return title.strip() if title else None, html_to_text(description)
+    title = parser.title.strip() if parser.title else None
+    return title, _clean("".join(parser.parts))
+
+
+def _decode(body, headers):
+    charset = re.search(r"charset=([\w-]+)", headers.get("content-type", ""))
+    try:
+        return body.decode(charset.group(1) if charset else "utf-8", "replace")
+    except LookupError:
+        return body.decode("utf-8", "replace")
+
+
+class JDFetcher:
+    """Fetches job postings concurrently, at most per_host_limit per host.
+
+    Usable as an async context manager, which closes the transport.
+    """
+
+    def __init__(
+        self,
+        transport=None,
+        cache=None,
+        per_host_limit=PER_HOST_LIMIT,
+        max_concurrency=MAX_CONCURRENCY,
+        retries=MAX_RETRIES,
+    ):
+        self.transport = transport or HttpTransport()
+        self.cache = cache if cache is not None else get_default_jd_cache()
+        self.per_host_limit = per_host_limit
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self._host_slots = {}
+        self._slots = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.transport.aclose()
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_slots[host]
+
+    async def _request(self, url, headers):
+        # Only network failures and 5xx replies are retried; anything else,
+        # such as a bad or unsafe URL, fails on the first attempt
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.transport.fetch(url, headers)
+                if response.status < 500 or attempt == self.retries:
+                    return response
+            except TransientFetchError:
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(0.5 * 2**attempt)
+
+    async def fetch(self, url):
+        url = url.strip()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        cached = self.cache.get(url)
+        if cached and cached["expires"] and cached["expires"] > time.time():
+            return FetchedJD(
+                url, cached["status"], cached["title"], cached["text"], True
+            )
+
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            async with self._slots, self._host_slot(url):
+                response = await self._request(url, headers)
+        except Exception as e:
+            print(f"JD fetch error for {url}: {e}")
+            return FetchedJD(url, 0, None, "", error=str(e))
+
+        if response.status == 304 and cached:
+            cached = {**cached, "expires": _expiry(response.headers)}
+            self.cache.put(url, cached)
+            return FetchedJD(
+                url, cached["status"], cached["title"], cached["text"], True
+            )
+        if response.status != 200:
+            return FetchedJD(
+                url, response.status, None, "", error=f"HTTP {response.status}"
+            )
+
+        title, text = extract_job_posting(_decode(response.body, response.headers))
+        self.cache.put(
+            url,
+            {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "expires": _expiry(response.headers),
+                "status": response.status,
+                "title": title,
+                "text": text,
+            },
+        )
+        return FetchedJD(url, response.status, title, text)
+
+    async def fetch_many(self, urls):
+        """FetchedJD per URL in input order; total time is bounded by the
+        concurrency limits rather than the sum of request latencies."""
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
+
+
+async def _fetch_all(urls, transport, cache):
+    async with JDFetcher(transport, cache) as fetcher:
+        return await fetcher.fetch_many(urls)
+
+
+def fetch_job_descriptions(urls, transport=None, cache=None):
+    """Synchronous bulk fetch for scripts and the Streamlit app."""
+    return asyncio.run(_fetch_all(list(urls), transport, cache))
+
+
+def fetch_job_description(url, transport=None, cache=None):
+    return fetch_job_descriptions([url], transport, cache)[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch job descriptions")
+    parser.add_argument("urls", nargs="+")
+    parser.add_argument("--output", help="JSONL file, default stdout")
+    parser.add_argument("--fixtures", help="serve saved HTML files from this folder")
+    args = parser.parse_args(argv)
+
+    transport = FileTransport(root=args.fixtures) if args.fixtures else None
+    start_time = time.perf_counter()
+    results = fetch_job_descriptions(args.urls, transport)
+    elapsed = time.perf_counter() - start_time
+
+    lines = [json.dumps(asdict(result)) for result in results]
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write("\n".join(lines) + "\n")
+    else:
+        print("\n".join(lines))
+    failed = sum(1 for result in results if result.error)
+    print(f"{len(results)} JDs, {failed} failed, {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+from scripts.matcher import _combine_scores, _keyword_profile
+from scripts.embedding_cache import encode_cached, model_cache_name
+from scripts.text_processing import PREPROCESS_VERSION
+from scripts.taxonomy import TAXONOMY
+import numpy as np
+import heapq
+import json
+import os
+
+VECTORS_FILE = "vectors.f32"
+META_FILE = "meta.json"
+IVF_FILE = "ivf.npz"
+
+
+def _profile_to_json(profile):
+    return {
+        "skills": sorted(profile["skills"]),
+        "edu": sorted(profile["edu"]),
+        "roles": sorted(profile["roles"]),
+        "exp": profile["exp"],
+    }
+
+
+def _profile_from_json(data):
+    return {
+        "skills": set(data["skills"]),
+        "skill_bits": TAXONOMY.bitset(data["skills"]),
+        "edu": set(data["edu"]),
+        "roles": set(data["roles"]),
+        "exp": data["exp"],
+    }
+
+
+class JDIndex:
+    """Persistent index of job descriptions for "which jobs fit this resume".
+
+    Normalized float32 embeddings live in a memory-mapped file next to a
+    JSON file holding each JD's id and precomputed keyword profile. JDs can
+    be added and deleted incrementally; deleted rows are tombstoned until
+    compact() rewrites the file. An optional IVF (k-means clustering) mode
+    restricts queries to the nearest clusters for very large catalogs.
+
+    The PREPROCESS_VERSION of the stored JDs is recorded; an index built
+    with other preprocessing must be rebuilt before JDs are added to it.
+    """
+
+    def __init__(self, path, dim=384, model_name=None):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            self.dim = meta["dim"]
+            self.model_name = meta["model_name"]
+            self.capacity = meta["capacity"]
+            self.ids = meta["ids"]
+            self.alive = meta["alive"]
+            self.profiles = [_profile_from_json(p) for p in meta["profiles"]]
+            self.preprocess_version = meta.get("preprocess_version", 1)
+            if self.preprocess_version != PREPROCESS_VERSION and self.ids:
+                print(
+                    f"JD index {path} was built with preprocessing version "
+                    f"{self.preprocess_version}, now {PREPROCESS_VERSION}; rebuild it"
+                )
+        else:
+            self.dim = dim
+            self.model_name = model_name
+            self.capacity = 0
+            self.ids = []
+            self.alive = []
+            self.profiles = []
+            self.preprocess_version = PREPROCESS_VERSION
+        self._rows = {
+            jd_id: row for row, jd_id in enumerate(self.ids) if self.alive[row]
+        }
+        self._vectors = None
+        self._open_vectors()
+        self._load_ivf()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, jd_id):
+        return jd_id in self._rows
+
+    def _open_vectors(self, capacity=None):
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        if capacity is not None:
+            with open(os.path.join(self.path, VECTORS_FILE), "ab") as f:
+                f.truncate(capacity * self.dim * 4)
+            self.capacity = capacity
+        if self.capacity:
+            self._vectors = np.memmap(
+                os.path.join(self.path, VECTORS_FILE),
+                dtype=np.float32,
+                mode="r+",
+                shape=(self.capacity, self.dim),
+            )
+
+    def _load_ivf(self):
+        self.centroids = None
+        self.assignments = None
+        ivf_path = os.path.join(self.path, IVF_FILE)
+        if os.path.exists(ivf_path):
+            data = np.load(ivf_path)
+            self.centroids = data["centroids"]
+            self.assignments = data["assignments"]
+
+    def save(self):
+        if self._vectors is not None:
+            self._vectors.flush()
+        meta = {
+            "dim": self.dim,
+            "model_name": self.model_name,
+            "capacity": self.capacity,
+            "ids": self.ids,
+            "alive": self.alive,
+            "profiles": [_profile_to_json(p) for p in self.profiles],
+            "preprocess_version": self.preprocess_version,
+        }
+        tmp_path = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(self.path, META_FILE))
+        if self.centroids is not None:
+            np.savez(
+                os.path.join(self.path, IVF_FILE),
+                centroids=self.centroids,
+                assignments=self.assignments[: len(self.ids)],
+            )
+
+    def add(self, model, jd_ids, processed_job_descs, batch_size=64):
+        """Inserts or replaces JDs, encoding them in batches.
+
+        An id given more than once keeps its last text.
+        """
+        if self.model_name is None:
+            self.model_name = model_cache_name(model)
+        elif self.model_name != model_cache_name(model):
+            raise ValueError(
+                f"Index was built with {self.model_name}, not {model_cache_name(model)}"
+            )
+
+        if self.preprocess_version != PREPROCESS_VERSION:
+            if self._rows:
+                raise ValueError(
+                    f"Index was built with preprocessing version "
+                    f"{self.preprocess_version}, not {PREPROCESS_VERSION}"
+                )
+            self.preprocess_version = PREPROCESS_VERSION
+
+        latest = dict(zip(jd_ids, processed_job_descs))
+        jd_ids, processed_job_descs = list(latest), list(latest.values())
+        self.delete([jd_id for jd_id in jd_ids if jd_id in self._rows], save=False)
+        embeddings = encode_cached(model, processed_job_descs, batch_size=batch_size)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings = embeddings / np.maximum(norms, 1e-12)
+
+        if self.capacity == 0:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(
+                f"Expected {self.dim}-dim embeddings, got {embeddings.shape[1]}"
+            )
+
+        start = len(self.ids)
+        needed = start + len(jd_ids)
+        if needed > self.capacity:
+            self._open_vectors(max(needed, self.capacity * 2, 1024))
+        self._vectors[start:needed] = embeddings
+
+        for jd_id, text in zip(jd_ids, processed_job_descs):
+            self._rows[jd_id] = len(self.ids)
+            self.ids.append(jd_id)
+            self.alive.append(True)
+            self.profiles.append(_keyword_profile(text))
+
+        if self.centroids is not None:
+            new_assignments = np.argmax(embeddings @ self.centroids.T, axis=1)
+            self.assignments = np.concatenate(
+                [self.assignments[:start], new_assignments.astype(np.int32)]
+            )
+        self.save()
+
+    def delete(self, jd_ids, save=True):
+        for jd_id in jd_ids:
+            row = self._rows.pop(jd_id, None)
+            if row is not None:
+                self.alive[row] = False
+                self._vectors[row] = 0
+        if save:
+            self.save()
+
+    def compact(self):
+        """Drops deleted rows, renumbers the remaining ones and shrinks the
+        vectors file to fit them."""
+        keep = [row for row, alive in enumerate(self.alive) if alive]
+        vectors = np.array(self._vectors[keep]) if keep else None
+        self.ids = [self.ids[row] for row in keep]
+        self.profiles = [self.profiles[row] for row in keep]
+        self.alive = [True] * len(keep)
+        if self.assignments is not None:
+            self.assignments = self.assignments[keep]
+        self._rows = {jd_id: row for row, jd_id in enumerate(self.ids)}
+        if vectors is not None:
+            self._vectors[: len(keep)] = vectors
+        self._open_vectors(len(keep))
+        self.save()
+
+    def build_ann(self, n_lists=None, iterations=10, seed=0):
+        """Clusters the live vectors with spherical k-means for IVF search."""
+        count = len(self.ids)
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        n_lists = n_lists or max(1, int(np.sqrt(len(live))))
+        vectors = np.asarray(self._vectors[:count])
+        rng = np.random.default_rng(seed)
+        centroids = vectors[
+            rng.choice(live, size=min(n_lists, len(live)), replace=False)
+        ]
+        for _ in range(iterations):
+            assignments = np.argmax(vectors[live] @ centroids.T, axis=1)
+            for cluster in range(len(centroids)):
+                members = vectors[live[assignments == cluster]]
+                if len(members):
+                    center = members.mean(axis=0)
+                    centroids[cluster] = center / max(np.linalg.norm(center), 1e-12)
+        self.centroids = centroids.astype(np.float32)
+        self.assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(
+            np.int32
+        )
+        self.save()
+
+    def search(
+        self, resume_embedding, processed_resume, top_k=10, rerank=None, n_probe=None
+    ):
+        """Returns the top_k JDs for a resume as score breakdown dicts.
+
+        Semantic similarity is one matrix-vector product over every live JD
+        (or only the n_probe nearest IVF clusters). The hybrid score is then
+        computed for the best rerank candidates, top_k * 10 by default.
+        """
+        count = len(self.ids)
+        if not self._rows:
+            return []
+
+        query = np.asarray(resume_embedding, dtype=np.float32).reshape(-1)
+        query = query / max(np.linalg.norm(query), 1e-12)
+
+        if n_probe and self.centroids is not None:
+            clusters = np.argsort(self.centroids @ query)[-n_probe:]
+            rows = np.flatnonzero(np.isin(self.assignments[:count], clusters))
+        else:
+            rows = np.arange(count)
+        rows = rows[np.asarray(self.alive, dtype=bool)[rows]]
+        if not len(rows):
+            return []
+
+        semantic_scores = np.asarray(self._vectors[rows]) @ query
+        rerank = min(len(rows), rerank or top_k * 10)
+        shortlist = np.argpartition(-semantic_scores, rerank - 1)[:rerank]
+
+        resume_profile = _keyword_profile(processed_resume)
+        results = []
+        for position in shortlist:
+            row = int(rows[position])
+            scores = _combine_scores(
+                float(semantic_scores[position]), resume_profile, self.profiles[row]
+            )
+            scores["jd_id"] = self.ids[row]
+            results.append(scores)
+        return heapq.nlargest(top_k, results, key=lambda r: r["final_score"])
+
+    def query(self, model, processed_resume, top_k=10, rerank=None, n_probe=None):
+        resume_embedding = encode_cached(model, [processed_resume])[0]
+        return self.search(resume_embedding, processed_resume, top_k, rerank, n_probe)
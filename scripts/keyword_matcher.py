@@ -0,0 +1,73 @@
+from functools import lru_cache
+import re
+
+# Words keep "+", "#" and inner dots so "c++", "c#" and "node.js" stay whole.
+# Every other punctuation mark is its own token, which stops phrases from
+# matching across commas and lets "python/sql" match both skills. NLTK's
+# Treebank tokenizer still splits "c#" into "c #", so terms ending in "#"
+# are also matched in that form (see _token_variants).
+TOKEN_REGEX = re.compile(r"(?:[^\W_]|[+#])+(?:\.(?:[^\W_]|[+#])+)*|\S")
+
+_TERMINAL = None
+
+
+def tokenize(text):
+    return TOKEN_REGEX.findall(text.lower())
+
+
+def _token_variants(term):
+    tokens = tokenize(term)
+    yield tokens
+    split = []
+    for token in tokens:
+        if len(token) > 1 and token.endswith("#"):
+            split.extend((token[:-1], "#"))
+        else:
+            split.append(token)
+    if split != tokens:
+        yield split
+
+
+class KeywordMatcher:
+    """Token trie that finds every term of every category in one pass.
+
+    Terms only match on whole tokens, so "r" and "go" no longer match inside
+    other words, and overlapping terms such as "machine learning" and
+    "machine learning engineer" are both reported.
+    """
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._trie = {}
+        for category, terms in categories.items():
+            for term in terms:
+                for tokens in _token_variants(term):
+                    node = self._trie
+                    for token in tokens:
+                        node = node.setdefault(token, {})
+                    node.setdefault(_TERMINAL, []).append((category, term))
+
+    def find_in_tokens(self, tokens):
+        found = {category: set() for category in self.categories}
+        trie = self._trie
+        for start in range(len(tokens)):
+            node = trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                for category, term in node.get(_TERMINAL, ()):
+                    found[category].add(term)
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return found
+
+    def find(self, text):
+        """Returns a dict mapping each category to the set of terms found."""
+        return self.find_in_tokens(tokenize(text))
+
+
+@lru_cache(maxsize=64)
+def matcher_for(keywords):
+    """Cached single-category matcher for an ad-hoc tuple of keywords."""
+    return KeywordMatcher({"keywords": keywords})
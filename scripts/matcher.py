@@ -1,104 +1,82 @@
 # matcher.py
-from sentence_transformers import SentenceTransformer, util
-from scripts.constants import (
-    GENERAL_SKILLS,
-    EDUCATION_KEYWORDS,
-    JOB_ROLES,
-    TOOL_SYNONYMS,
-)
-import re
+from scripts.model_loader import load_sentence_model
+from scripts.encoder import AdaptiveEncoder
+from scripts.embedding_cache import encode_cached
+from scripts.chunking import chunked_semantic_score
+from scripts.experience import extract_years_of_experience  # noqa: F401
+from scripts.structured_parser import parse_document
+from scripts.keyword_matcher import matcher_for
+from scripts.metrics import timed
+from scripts.taxonomy import TAXONOMY
+import heapq
 import os
 
+# Weights of the keyword score components
+SKILL_WEIGHT = 0.5
+EDU_WEIGHT = 0.2
+ROLE_WEIGHT = 0.1
+EXP_WEIGHT = 0.2
 
-# Load the model safely with HuggingFace token
-def load_model():
-    hf_token = os.getenv("HF_TOKEN")
+# Weights of the semantic and keyword scores in the final score
+SEMANTIC_WEIGHT = 0.6
+KEYWORD_WEIGHT = 0.4
+
+
+# Load the model from local_model/ when available, else the Hub with HF token.
+# It is wrapped in the adaptive batching encoder unless
+# SAMARTH_ADAPTIVE_ENCODER is set to 0.
+def load_model(variant=None):
     try:
-        model = SentenceTransformer("all-MiniLM-L6-v2", use_auth_token=hf_token)
-        return model
+        model = load_sentence_model(variant=variant)
+        if os.getenv("SAMARTH_ADAPTIVE_ENCODER", "1").strip().lower() in ("0", "off"):
+            return model
+        return AdaptiveEncoder(model)
     except Exception as e:
         print(f"Error loading model: {e}")
         return None
 
 
-# (Rest of your code remains unchanged below)
-
-
+@timed("keyword_extraction")
 def extract_keywords(text, keywords):
-    text = text.lower()
-    found = [kw for kw in keywords if kw in text]
-    return set(found)
+    return matcher_for(tuple(keywords)).find(text)["keywords"]
 
 
 def normalize_tools(tools):
-    normalized = set(tools)
-    for base, synonyms in TOOL_SYNONYMS.items():
-        for synonym in synonyms:
-            if synonym in normalized:
-                normalized.discard(synonym)
-                normalized.add(base)
-    return normalized
-
+    return {TAXONOMY.canonical(tool) for tool in tools}
 
-def extract_years_of_experience(text):
-    matches = re.findall(r"(\d+(?:\.\d+)?)\s*(?:\+?\s*)?(?:years|yrs)", text.lower())
-    if matches:
-        years = [float(match) for match in matches if float(match) < 40]
-        return max(years) if years else 0
-    return 0
 
+def _keyword_profile(text):
+    # Only the keyword fields are used, so preprocessed text is fine here
+    return parse_document(text).keyword_profile()
 
-def calculate_match_score(
-    model, processed_resume: str, processed_job_desc: str
-) -> dict:
-    resume_embedding = model.encode(processed_resume, convert_to_tensor=True)
-    jd_embedding = model.encode(processed_job_desc, convert_to_tensor=True)
-    semantic_score = util.cos_sim(resume_embedding, jd_embedding).item()
 
-    resume_skills = set()
-    jd_skills = set()
-
-    for category in GENERAL_SKILLS:
-        resume_skills.update(
-            extract_keywords(processed_resume, GENERAL_SKILLS[category])
-        )
-        jd_skills.update(extract_keywords(processed_job_desc, GENERAL_SKILLS[category]))
-
-    resume_edu = extract_keywords(processed_resume, EDUCATION_KEYWORDS)
-    jd_edu = extract_keywords(processed_job_desc, EDUCATION_KEYWORDS)
-
-    resume_roles = extract_keywords(processed_resume, JOB_ROLES)
-    jd_roles = extract_keywords(processed_job_desc, JOB_ROLES)
-
-    normalized_resume_skills = normalize_tools(resume_skills)
-    normalized_jd_skills = normalize_tools(jd_skills)
-
-    skill_match_ratio = len(normalized_resume_skills & normalized_jd_skills) / max(
-        len(normalized_jd_skills), 1
+def _combine_scores(semantic_score, resume_profile, jd_profile):
+    jd_skills = jd_profile["skill_bits"]
+    skill_match_ratio = TAXONOMY.overlap(resume_profile["skill_bits"], jd_skills) / max(
+        jd_skills.bit_count(), 1
+    )
+    edu_match_ratio = len(resume_profile["edu"] & jd_profile["edu"]) / max(
+        len(jd_profile["edu"]), 1
     )
-    edu_match_ratio = len(resume_edu & jd_edu) / max(len(jd_edu), 1)
-    role_match = 1 if resume_roles & jd_roles else 0
+    role_match = 1 if resume_profile["roles"] & jd_profile["roles"] else 0
 
-    resume_exp = extract_years_of_experience(processed_resume)
-    jd_exp = extract_years_of_experience(processed_job_desc)
+    resume_exp = resume_profile["exp"]
+    jd_exp = jd_profile["exp"]
     if jd_exp > 0:
         exp_match_ratio = min(resume_exp / jd_exp, 1.0)
     else:
         exp_match_ratio = 1.0
 
-    skill_weight = 0.5
-    edu_weight = 0.2
-    role_weight = 0.1
-    exp_weight = 0.2
-
     keyword_score = (
-        skill_weight * skill_match_ratio
-        + edu_weight * edu_match_ratio
-        + role_weight * role_match
-        + exp_weight * exp_match_ratio
+        SKILL_WEIGHT * skill_match_ratio
+        + EDU_WEIGHT * edu_match_ratio
+        + ROLE_WEIGHT * role_match
+        + EXP_WEIGHT * exp_match_ratio
     )
 
-    final_score = round((0.6 * semantic_score + 0.4 * keyword_score) * 100, 2)
+    final_score = round(
+        (SEMANTIC_WEIGHT * semantic_score + KEYWORD_WEIGHT * keyword_score) * 100, 2
+    )
 
     return {
         "final_score": final_score,
@@ -111,3 +89,101 @@ def calculate_match_score(
         "resume_exp": resume_exp,
         "jd_exp": jd_exp,
     }
+
+
+def match_from_embeddings(
+    resume_embedding, jd_embedding, processed_resume: str, processed_job_desc: str
+) -> dict:
+    from sentence_transformers import util
+
+    semantic_score = util.cos_sim(resume_embedding, jd_embedding).item()
+
+    return _combine_scores(
+        semantic_score,
+        _keyword_profile(processed_resume),
+        _keyword_profile(processed_job_desc),
+    )
+
+
+def calculate_match_score(
+    model,
+    processed_resume: str,
+    processed_job_desc: str,
+    cache=None,
+    chunking=None,
+    pooling="mean",
+) -> dict:
+    """Hybrid semantic and keyword match score for one resume and JD.
+
+    By default each document is encoded as one string, which the model
+    truncates at its max sequence length. Set chunking to "window" or
+    "section" to embed the full documents in chunks, pooled with "mean",
+    "max" or "maxsim".
+    """
+    if chunking:
+        semantic_score = chunked_semantic_score(
+            model, processed_resume, processed_job_desc, chunking, pooling, cache
+        )
+        return _combine_scores(
+            semantic_score,
+            _keyword_profile(processed_resume),
+            _keyword_profile(processed_job_desc),
+        )
+
+    resume_embedding, jd_embedding = encode_cached(
+        model, [processed_resume, processed_job_desc], cache=cache
+    )
+    return match_from_embeddings(
+        resume_embedding, jd_embedding, processed_resume, processed_job_desc
+    )
+
+
+def rank_from_embeddings(
+    jd_embedding,
+    resume_embeddings,
+    processed_job_desc: str,
+    processed_resumes: list,
+    top_k: int = 10,
+) -> list:
+    from sentence_transformers import util
+
+    semantic_scores = util.cos_sim(jd_embedding, resume_embeddings)[0].tolist()
+
+    jd_profile = _keyword_profile(processed_job_desc)
+    results = []
+    for index, (resume, semantic_score) in enumerate(
+        zip(processed_resumes, semantic_scores)
+    ):
+        scores = _combine_scores(semantic_score, _keyword_profile(resume), jd_profile)
+        scores["index"] = index
+        results.append(scores)
+
+    if top_k:
+        return heapq.nlargest(top_k, results, key=lambda r: r["final_score"])
+    return sorted(results, key=lambda r: r["final_score"], reverse=True)
+
+
+def rank_resumes(
+    model,
+    processed_job_desc: str,
+    processed_resumes: list,
+    top_k: int = 10,
+    batch_size: int = 64,
+    cache=None,
+) -> list:
+    """Scores many resumes against one job description and returns the top_k.
+
+    The JD is encoded and profiled once, resumes are encoded in batches and
+    compared with a single similarity matrix. Each result is the same
+    breakdown dict as calculate_match_score plus the resume's input index.
+    """
+    if not processed_resumes:
+        return []
+
+    jd_embedding = encode_cached(model, [processed_job_desc], cache=cache)
+    resume_embeddings = encode_cached(
+        model, processed_resumes, cache=cache, batch_size=batch_size
+    )
+    return rank_from_embeddings(
+        jd_embedding, resume_embeddings, processed_job_desc, processed_resumes, top_k
+    )
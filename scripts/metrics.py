@@ -0,0 +1,167 @@
+from functools import wraps
+import threading
+import asyncio
+import time
+import json
+import os
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_enabled = os.getenv("SAMARTH_METRICS", "1").lower() not in ("0", "off", "false")
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def observe(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = {
+                "buckets": [0] * len(BUCKETS),
+                "count": 0,
+                "sum": 0.0,
+            }
+        for index, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram["buckets"][index] += 1
+                break
+        histogram["count"] += 1
+        histogram["sum"] += seconds
+
+
+def increment(name, value=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(stage):
+    """Context manager recording the duration of its block under stage."""
+    return _Timer(stage) if _enabled else _NULL_TIMER
+
+
+def timed(stage):
+    """Decorator version of timer for plain and async functions."""
+
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+
+            @wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with _Timer(stage):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def snapshot():
+    """Returns all histograms and counters as plain dicts."""
+    with _lock:
+        stages = {}
+        for stage, histogram in _histograms.items():
+            count = histogram["count"]
+            stages[stage] = {
+                "count": count,
+                "sum_seconds": round(histogram["sum"], 6),
+                "mean_ms": round(histogram["sum"] / count * 1000, 3) if count else 0,
+                "buckets": dict(zip(map(str, BUCKETS), histogram["buckets"])),
+            }
+        return {"enabled": _enabled, "stages": stages, "counters": dict(_counters)}
+
+
+def dump_json(path=None):
+    text = json.dumps(snapshot(), indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(text)
+    return text
+
+
+def render_prometheus():
+    """Returns the metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP samarth_stage_seconds Time spent in each pipeline stage.",
+        "# TYPE samarth_stage_seconds histogram",
+    ]
+    with _lock:
+        for stage, histogram in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'samarth_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(
+                f'samarth_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} '
+                f'{histogram["count"]}'
+            )
+            lines.append(
+                f'samarth_stage_seconds_sum{{stage="{stage}"}} {histogram["sum"]}'
+            )
+            lines.append(
+                f'samarth_stage_seconds_count{{stage="{stage}"}} {histogram["count"]}'
+            )
+
+        lines.append("# HELP samarth_events_total Pipeline event counters.")
+        lines.append("# TYPE samarth_events_total counter")
+        for name, value in sorted(_counters.items()):
+            lines.append(f'samarth_events_total{{name="{name}"}} {value}')
+    return "\n".join(lines) + "\n"
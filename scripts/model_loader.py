@@ -0,0 +1,146 @@
+import time
+import os
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+LOCAL_MODEL_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "local_model"
+)
+WEIGHT_FILES = ("model.safetensors", "pytorch_model.bin")
+VARIANTS = ("fp32", "int8")
+
+_load_stats = {}
+
+
+def _env_flag(name):
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _is_lfs_pointer(path):
+    # A git-lfs checkout without `git lfs pull` leaves a small text stub
+    with open(path, "rb") as f:
+        return f.read(64).startswith(b"version https://git-lfs")
+
+
+def has_local_weights(path):
+    if not os.path.isfile(os.path.join(path, "modules.json")):
+        return False
+    for name in WEIGHT_FILES:
+        weights = os.path.join(path, name)
+        if os.path.isfile(weights) and not _is_lfs_pointer(weights):
+            return True
+    return False
+
+
+def resolve_model_source(offline=None):
+    """Returns a local model directory, or the Hub name when allowed.
+
+    SAMARTH_MODEL_PATH wins, then the bundled local_model/ directory. The Hub
+    is only used when SAMARTH_OFFLINE is not set.
+    """
+    if offline is None:
+        offline = _env_flag("SAMARTH_OFFLINE")
+
+    candidates = [os.getenv("SAMARTH_MODEL_PATH"), LOCAL_MODEL_DIR]
+    for path in candidates:
+        if path and has_local_weights(path):
+            return path
+
+    if offline:
+        raise FileNotFoundError(
+            f"Offline mode is on and no model weights were found in {LOCAL_MODEL_DIR}"
+            " (run `git lfs pull` or set SAMARTH_MODEL_PATH)"
+        )
+    return MODEL_NAME
+
+
+def _directory_size_mb(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            total += os.path.getsize(os.path.join(root, name))
+    return round(total / 2**20, 2)
+
+
+def memory_size_mb(model):
+    import torch
+
+    total = 0
+    try:
+        values = list(model.state_dict().values())
+    except Exception:
+        return None
+    while values:
+        value = values.pop()
+        if isinstance(value, (tuple, list)):
+            values.extend(value)
+        elif torch.is_tensor(value):
+            total += value.numel() * value.element_size()
+    return round(total / 2**20, 2)
+
+
+def _quantize_int8(model):
+    import torch
+
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def load_sentence_model(variant=None, offline=None):
+    """Loads the SentenceTransformer and records load time and size.
+
+    variant is "fp32" (default) or "int8" for dynamic quantization of the
+    Linear layers. SAMARTH_MODEL_VARIANT sets the default.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    variant = (variant or os.getenv("SAMARTH_MODEL_VARIANT") or "fp32").lower()
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown model variant {variant!r}, expected {VARIANTS}")
+
+    if offline is None:
+        offline = _env_flag("SAMARTH_OFFLINE")
+    if offline:
+        os.environ.setdefault("HF_HUB_OFFLINE", "1")
+        os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    source = resolve_model_source(offline)
+    start_time = time.perf_counter()
+
+    kwargs = {}
+    if source == MODEL_NAME and os.getenv("HF_TOKEN"):
+        kwargs["use_auth_token"] = os.getenv("HF_TOKEN")
+
+    model = SentenceTransformer(source, **kwargs)
+    if variant == "int8":
+        model = _quantize_int8(model)
+
+    load_seconds = time.perf_counter() - start_time
+
+    if source == MODEL_NAME or os.path.abspath(source) == LOCAL_MODEL_DIR:
+        name = MODEL_NAME
+    else:
+        name = os.path.basename(os.path.normpath(source))
+    model.cache_name = name if variant == "fp32" else f"{name}-{variant}"
+
+    _load_stats.clear()
+    _load_stats.update(
+        {
+            "source": source,
+            "variant": variant,
+            "offline": offline,
+            "load_seconds": round(load_seconds, 3),
+            "memory_mb": memory_size_mb(model),
+            "disk_mb": _directory_size_mb(source) if os.path.isdir(source) else None,
+        }
+    )
+    print(
+        f"Loaded {model.cache_name} from {source} in {_load_stats['load_seconds']}s"
+        f" ({_load_stats['memory_mb']} MB in memory)"
+    )
+    return model
+
+
+def get_load_stats():
+    """Stats from the most recent load_sentence_model call."""
+    return dict(_load_stats)
@@ -0,0 +1,199 @@
+from scripts.resume_parser import iter_pdf_pages
+from scripts.metrics import timer, increment
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import hashlib
+import sqlite3
+import json
+import time
+import os
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    ".cache",
+    "pdf_text.sqlite",
+)
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractedPDF:
+    """Text of a PDF plus (page_number, chars, seconds) for each page."""
+
+    sha256: str
+    text: str
+    pages: tuple
+
+    @property
+    def size(self):
+        return len(self.text.encode("utf-8"))
+
+
+class PDFTextCache:
+    """Content-addressed store of extracted PDF text.
+
+    Keys are the SHA-256 of the file bytes, so the same resume is parsed by
+    PyMuPDF once no matter which session uploads it, and a changed file
+    never gets stale text. Entries are evicted least recently used first
+    once their text exceeds max_bytes, in memory and on disk separately.
+    """
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_text (key TEXT PRIMARY KEY, "
+                "text TEXT NOT NULL, pages TEXT NOT NULL, size INTEGER NOT NULL, "
+                "accessed REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, entry):
+        previous = self._memory.pop(entry.sha256, None)
+        if previous is not None:
+            self._memory_bytes -= previous.size
+        self._memory[entry.sha256] = entry
+        self._memory_bytes += entry.size
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+            if self._db is None:
+                return None
+
+            row = self._db.execute(
+                "SELECT text, pages FROM pdf_text WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE pdf_text SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+            entry = ExtractedPDF(key, row[0], tuple(map(tuple, json.loads(row[1]))))
+            self._remember(entry)
+            return entry
+
+    def put(self, entry):
+        with self._lock:
+            self._remember(entry)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO pdf_text (key, text, pages, size, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    entry.sha256,
+                    entry.text,
+                    json.dumps(entry.pages),
+                    entry.size,
+                    time.time(),
+                ),
+            )
+            self._evict_disk()
+            self._db.commit()
+
+    def _evict_disk(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pdf_text")
+        excess = total.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        rows = self._db.execute(
+            "SELECT key, size FROM pdf_text ORDER BY accessed"
+        ).fetchall()
+        # Always keep the newest entry, even when it alone exceeds the limit
+        stale = []
+        for key, size in rows[:-1]:
+            if excess <= 0:
+                break
+            stale.append((key,))
+            excess -= size
+        self._db.executemany("DELETE FROM pdf_text WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM pdf_text")
+                self._db.commit()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_pdf_cache():
+    """Process-wide cache, in memory only by default since resumes hold
+    personal data. Set SAMARTH_PDF_CACHE to a path, or to "on" for
+    DEFAULT_CACHE_PATH, to also keep extracted text on disk."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            path = os.getenv("SAMARTH_PDF_CACHE", "")
+            if path.lower() in ("", "off", "none", "0"):
+                path = None
+            elif path.lower() in ("on", "1"):
+                path = DEFAULT_CACHE_PATH
+            try:
+                _default_cache = PDFTextCache(path)
+            except sqlite3.Error as e:
+                print(f"PDF cache error: {e}")
+                _default_cache = PDFTextCache()
+    return _default_cache
+
+
+def _read_bytes(pdf_file):
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if isinstance(pdf_file, (str, os.PathLike)):
+        with open(pdf_file, "rb") as f:
+            return f.read()
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    return pdf_file.read()
+
+
+def extract_pdf_cached(pdf_file, cache=None):
+    """Returns an ExtractedPDF, running PyMuPDF only for unseen file contents.
+
+    pdf_file can be a path, raw bytes or a file-like object such as a
+    Streamlit upload.
+    """
+    if cache is None:
+        cache = get_default_pdf_cache()
+
+    data = _read_bytes(pdf_file)
+    key = hashlib.sha256(data).hexdigest()
+    entry = cache.get(key)
+    if entry is not None:
+        increment("pdf_cache_hits")
+        return entry
+
+    increment("pdf_cache_misses")
+    timings = []
+    with timer("pdf_extraction"):
+        page_texts = list(iter_pdf_pages(data, timings))
+    pages = tuple(
+        (number, len(text), round(seconds, 6))
+        for number, (text, seconds) in enumerate(zip(page_texts, timings), start=1)
+    )
+    entry = ExtractedPDF(key, "".join(page_texts), pages)
+    cache.put(entry)
+    return entry
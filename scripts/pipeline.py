@@ -0,0 +1,154 @@
+from scripts.matcher import _combine_scores, _keyword_profile
+from scripts.embedding_cache import encode_cached
+from scripts.taxonomy import TAXONOMY
+from scripts.gemini_matcher import get_llm_feedback_async
+import numpy as np
+import asyncio
+import heapq
+import time
+
+PREFILTERS = ("keywords", "embedding")
+
+
+def _stage(report, name, candidates, kept, start_time):
+    report["stages"].append(
+        {
+            "name": name,
+            "candidates": candidates,
+            "kept": kept,
+            "pruned": candidates - kept,
+            "seconds": round(time.perf_counter() - start_time, 4),
+        }
+    )
+
+
+def _top(indices, scores, k):
+    if k is None or k >= len(indices):
+        return list(indices)
+    return [
+        indices[i] for i in heapq.nlargest(k, range(len(indices)), scores.__getitem__)
+    ]
+
+
+def _keyword_prefilter(profiles, jd_profile):
+    jd_skills = jd_profile["skill_bits"]
+    jd_skill_count = max(jd_skills.bit_count(), 1)
+    jd_roles = jd_profile["roles"]
+    scores = []
+    for profile in profiles:
+        overlap = TAXONOMY.overlap(profile["skill_bits"], jd_skills) / jd_skill_count
+        scores.append(overlap + (0.1 if profile["roles"] & jd_roles else 0))
+    return scores
+
+
+async def _llm_stage(results, resume_texts, job_description, budget_seconds):
+    tasks = {
+        asyncio.ensure_future(
+            get_llm_feedback_async(resume_texts[result["index"]], job_description)
+        ): result
+        for result in results
+    }
+    done, pending = await asyncio.wait(tasks, timeout=budget_seconds)
+    for task in pending:
+        task.cancel()
+    for task in done:
+        if not task.cancelled() and task.exception() is None:
+            tasks[task]["llm"] = task.result()
+    return len(done)
+
+
+def retrieve_then_rerank(
+    model,
+    processed_job_desc: str,
+    processed_resumes: list,
+    prefilter: str = "keywords",
+    prefilter_k: int = 200,
+    rerank_k: int = 20,
+    llm_k: int = 0,
+    llm_budget_seconds: float = None,
+    resume_texts: list = None,
+    job_description: str = None,
+    cache=None,
+):
+    """Ranks resumes cheaply first and runs the full scoring on survivors only.
+
+    Stage 1 keeps prefilter_k resumes by skill/role overlap ("keywords") or
+    by embedding dot product ("embedding"). Stage 2 computes the full hybrid
+    score for those and keeps rerank_k. Stage 3, when llm_k > 0, adds LLM
+    feedback for the best llm_k within llm_budget_seconds; pass the raw
+    resume_texts and job_description for it.
+
+    Returns (results, report) where results are calculate_match_score
+    breakdowns with the resume's input index, and report lists how many
+    candidates each stage kept and pruned.
+    """
+    if prefilter not in PREFILTERS:
+        raise ValueError(f"Unknown prefilter {prefilter!r}, expected {PREFILTERS}")
+
+    report = {"total": len(processed_resumes), "stages": []}
+    if not processed_resumes:
+        return [], report
+
+    jd_profile = _keyword_profile(processed_job_desc)
+    jd_embedding = encode_cached(model, [processed_job_desc], cache=cache)[0]
+    jd_embedding = jd_embedding / max(np.linalg.norm(jd_embedding), 1e-12)
+    candidates = list(range(len(processed_resumes)))
+    profiles = {}
+    embeddings = {}
+
+    # Stage 1: cheap prefilter
+    start_time = time.perf_counter()
+    if prefilter == "keywords":
+        for index in candidates:
+            profiles[index] = _keyword_profile(processed_resumes[index])
+        scores = _keyword_prefilter([profiles[i] for i in candidates], jd_profile)
+    else:
+        vectors = encode_cached(model, processed_resumes, cache=cache)
+        vectors = vectors / np.maximum(
+            np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12
+        )
+        embeddings = dict(zip(candidates, vectors))
+        scores = (vectors @ jd_embedding).tolist()
+    survivors = _top(candidates, scores, prefilter_k)
+    _stage(
+        report, f"prefilter_{prefilter}", len(candidates), len(survivors), start_time
+    )
+
+    # Stage 2: full semantic and keyword scoring
+    start_time = time.perf_counter()
+    missing = [index for index in survivors if index not in embeddings]
+    if missing:
+        vectors = encode_cached(
+            model, [processed_resumes[i] for i in missing], cache=cache
+        )
+        vectors = vectors / np.maximum(
+            np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12
+        )
+        embeddings.update(zip(missing, vectors))
+
+    results = []
+    for index in survivors:
+        if index not in profiles:
+            profiles[index] = _keyword_profile(processed_resumes[index])
+        semantic_score = float(embeddings[index] @ jd_embedding)
+        scores = _combine_scores(semantic_score, profiles[index], jd_profile)
+        scores["index"] = index
+        results.append(scores)
+    results = heapq.nlargest(
+        rerank_k or len(results), results, key=lambda r: r["final_score"]
+    )
+    _stage(report, "rerank", len(survivors), len(results), start_time)
+
+    # Stage 3: optional LLM feedback for the very top
+    if llm_k and results:
+        if resume_texts is None or job_description is None:
+            raise ValueError("resume_texts and job_description are needed for llm_k")
+        start_time = time.perf_counter()
+        completed = asyncio.run(
+            _llm_stage(
+                results[:llm_k], resume_texts, job_description, llm_budget_seconds
+            )
+        )
+        _stage(report, "llm_feedback", min(llm_k, len(results)), completed, start_time)
+
+    return results, report
@@ -0,0 +1,204 @@
+import numpy as np
+import json
+import os
+
+METHODS = ("float32", "float16", "int8", "binary")
+
+# Number of set bits in every byte value, for Hamming distances
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class QuantizedEmbeddings:
+    """Compact embedding store searched in two stages.
+
+    Every vector is L2-normalized and kept as codes: float16 halves the
+    memory, int8 (per-dimension min/max scalar quantization) quarters it
+    and binary (one bit per dimension) cuts it 32x. search() ranks
+    all codes approximately, then re-scores the best candidates with the
+    exact float32 vectors. Those are only read for the candidates, so
+    after save() they can stay memory-mapped on disk; until then they are
+    in memory and memory_report() counts them.
+    """
+
+    def __init__(self, method, codes, dim, full=None, offset=None, scale=None):
+        if method not in METHODS:
+            raise ValueError(f"Unknown quantization {method!r}, expected {METHODS}")
+        self.method = method
+        self.codes = codes
+        self.dim = dim
+        self.full = full
+        self.offset = offset
+        self.scale = scale
+
+    def __len__(self):
+        return len(self.codes)
+
+    @classmethod
+    def from_embeddings(cls, embeddings, method="int8", keep_full=True):
+        vectors = _normalize(embeddings)
+        dim = vectors.shape[1]
+        offset = scale = None
+        if method == "float32":
+            codes = vectors
+        elif method == "float16":
+            codes = vectors.astype(np.float16)
+        elif method == "int8":
+            offset = vectors.min(axis=0)
+            scale = np.maximum(vectors.max(axis=0) - offset, 1e-12) / 255
+            codes = (np.round((vectors - offset) / scale) - 128).astype(np.int8)
+        elif method == "binary":
+            # Thresholding at each dimension's mean rather than zero keeps
+            # the bits informative when all embeddings share a direction
+            offset = vectors.mean(axis=0)
+            codes = np.packbits(vectors > offset, axis=1)
+        else:
+            raise ValueError(f"Unknown quantization {method!r}, expected {METHODS}")
+        return cls(method, codes, dim, vectors if keep_full else None, offset, scale)
+
+    def approximate_scores(self, queries, block_size=65536):
+        """(n_queries, n_vectors) similarities computed from the codes only."""
+        queries = _normalize(np.atleast_2d(queries))
+        scores = np.empty((len(queries), len(self.codes)), dtype=np.float32)
+        if self.method == "binary":
+            query_bits = np.packbits(queries > self.offset, axis=1)
+        elif self.method == "int8":
+            # q . (offset + scale * (code + 128)), folded into one matmul
+            scaled = (queries * self.scale).T
+            constant = queries @ (self.offset + 128 * self.scale)
+
+        for start in range(0, len(self.codes), block_size):
+            block = self.codes[start : start + block_size]
+            rows = slice(start, start + len(block))
+            if self.method == "binary":
+                for row, bits in enumerate(query_bits):
+                    hamming = _POPCOUNT[block ^ bits].sum(axis=1, dtype=np.int32)
+                    scores[row, rows] = 1 - 2 * hamming / self.dim
+            elif self.method == "int8":
+                scores[:, rows] = (block.astype(np.float32) @ scaled + constant).T
+            else:
+                scores[:, rows] = (block.astype(np.float32) @ queries.T).T
+        return scores
+
+    def search(self, queries, top_k=10, rerank=100):
+        """Returns (indices, scores) arrays of shape (n_queries, top_k).
+
+        The rerank best candidates by approximate score are re-scored with
+        exact cosine similarity. rerank=0 (or no full vectors) returns the
+        approximate ranking.
+        """
+        queries = _normalize(np.atleast_2d(queries))
+        approximate = self.approximate_scores(queries)
+        top_k = min(top_k, len(self.codes))
+        if not rerank or self.full is None:
+            order = np.argsort(-approximate, axis=1, kind="stable")[:, :top_k]
+            return order, np.take_along_axis(approximate, order, axis=1)
+
+        keep = min(max(rerank, top_k), len(self.codes))
+        candidates = np.argpartition(-approximate, keep - 1, axis=1)[:, :keep]
+        indices = np.empty((len(queries), top_k), dtype=np.int64)
+        scores = np.empty((len(queries), top_k), dtype=np.float32)
+        for row, (query, rows) in enumerate(zip(queries, candidates)):
+            rows = np.sort(rows)
+            exact = np.asarray(self.full[rows], dtype=np.float32) @ query
+            order = np.argsort(-exact, kind="stable")[:top_k]
+            indices[row] = rows[order]
+            scores[row] = exact[order]
+        return indices, scores
+
+    def memory_report(self):
+        """Bytes held in memory versus plain float32 vectors.
+
+        Full vectors kept in memory for re-scoring count towards
+        resident_bytes; memory-mapped ones (after load()) do not.
+        """
+        float32_bytes = len(self.codes) * self.dim * 4
+        code_bytes = self.codes.nbytes
+        for extra in (self.offset, self.scale):
+            if extra is not None:
+                code_bytes += extra.nbytes
+        full_bytes = 0
+        if self.full is not None and not isinstance(self.full, np.memmap):
+            full_bytes = np.asarray(self.full).nbytes
+        resident_bytes = code_bytes + full_bytes
+        return {
+            "method": self.method,
+            "vectors": len(self.codes),
+            "dim": self.dim,
+            "float32_bytes": float32_bytes,
+            "code_bytes": code_bytes,
+            "full_bytes": full_bytes,
+            "resident_bytes": resident_bytes,
+            "saved_bytes": float32_bytes - resident_bytes,
+            "compression": round(float32_bytes / max(resident_bytes, 1), 2),
+        }
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "codes.npy"), self.codes)
+        if self.full is not None:
+            np.save(os.path.join(path, "full.npy"), np.asarray(self.full))
+        params = {"offset": self.offset, "scale": self.scale}
+        params = {name: value for name, value in params.items() if value is not None}
+        if params:
+            np.savez(os.path.join(path, "params.npz"), **params)
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"method": self.method, "dim": self.dim}, f)
+
+    @classmethod
+    def load(cls, path, mmap_full=True):
+        """Loads codes into memory; full vectors stay memory-mapped by default."""
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        codes = np.load(os.path.join(path, "codes.npy"))
+        full_path = os.path.join(path, "full.npy")
+        full = (
+            np.load(full_path, mmap_mode="r" if mmap_full else None)
+            if os.path.exists(full_path)
+            else None
+        )
+        offset = scale = None
+        params_path = os.path.join(path, "params.npz")
+        if os.path.exists(params_path):
+            with np.load(params_path) as params:
+                offset = params["offset"] if "offset" in params else None
+                scale = params["scale"] if "scale" in params else None
+        return cls(meta["method"], codes, meta["dim"], full, offset, scale)
+
+
+def ranking_agreement(embeddings, queries, method="int8", top_k=10, rerank=100):
+    """How closely quantized search reproduces exact util.cos_sim rankings.
+
+    Reports recall@top_k (the share of the exact top_k that is found) of
+    the approximate ranking and of the re-scored one, plus the memory
+    report of the quantized store.
+    """
+    import torch
+    from sentence_transformers import util
+
+    store = QuantizedEmbeddings.from_embeddings(embeddings, method)
+    top_k = min(top_k, len(store))
+    exact = util.cos_sim(
+        torch.as_tensor(np.asarray(queries, dtype=np.float32)),
+        torch.as_tensor(np.asarray(embeddings, dtype=np.float32)),
+    )
+    expected = torch.topk(exact, top_k, dim=1).indices.numpy()
+
+    def recall(found):
+        hits = sum(len(set(a) & set(b)) for a, b in zip(found, expected))
+        return round(hits / expected.size, 4)
+
+    approximate, _ = store.search(queries, top_k, rerank=0)
+    reranked, _ = store.search(queries, top_k, rerank=rerank)
+    return {
+        **store.memory_report(),
+        "top_k": top_k,
+        "rerank": rerank,
+        "recall_approximate": recall(approximate),
+        "recall_reranked": recall(reranked),
+    }
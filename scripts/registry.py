@@ -0,0 +1,125 @@
+from scripts.model_loader import memory_size_mb
+import importlib
+import threading
+import time
+import sys
+
+# Heavy models shared by every session and thread in this process
+_resources = {}
+_locks = {}
+_registry_lock = threading.Lock()
+_warm_up_thread = None
+_warm_up_times = {}
+
+
+def get_resource(name, loader):
+    """Returns the resource registered under name, loading it once.
+
+    Concurrent callers wait for the first load instead of loading their own
+    copy. A loader returning None is not cached, so the next call retries.
+    """
+    resource_value = _resources.get(name)
+    if resource_value is not None:
+        return resource_value
+
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+
+    with lock:
+        if name not in _resources:
+            resource_value = loader()
+            if resource_value is None:
+                return None
+            _resources[name] = resource_value
+        return _resources[name]
+
+
+def release_resource(name):
+    with _registry_lock:
+        _resources.pop(name, None)
+
+
+def loaded_resources():
+    return list(_resources)
+
+
+def _process_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return round(int(line.split()[1]) / 1024, 2)
+    except OSError:
+        pass
+    try:
+        # resource is Unix only
+        import resource
+    except ImportError:
+        return None
+    # Peak RSS is in bytes on macOS and kilobytes elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 1024), 2)
+
+
+def memory_usage():
+    """Process RSS plus the estimated size of every loaded model, in MB."""
+    models = {}
+    for name, resource_value in list(_resources.items()):
+        models[name] = (
+            memory_size_mb(resource_value)
+            if hasattr(resource_value, "state_dict")
+            else None
+        )
+    return {"process_rss_mb": _process_rss_mb(), "resources_mb": models}
+
+
+def get_model():
+    from scripts.matcher import load_model
+
+    return get_resource("sentence_model", load_model)
+
+
+def _import_task(module):
+    return lambda: importlib.import_module(module)
+
+
+def _default_warm_up_tasks():
+    from scripts.text_processing import _treebank
+
+    return {
+        "sentence_model": get_model,
+        "pymupdf": _import_task("fitz"),
+        "nltk_treebank": _treebank,
+    }
+
+
+def warm_up(tasks=None):
+    """Runs the loaders in tasks (name -> callable) in a background thread.
+
+    Meant to be called once the UI has rendered, so heavy imports and the
+    model load happen while the user is still typing. Only the first call
+    per process starts a thread; later calls return the same thread.
+    Defaults to the sentence model, PyMuPDF and the NLTK tokenizer.
+    """
+    global _warm_up_thread
+    with _registry_lock:
+        if _warm_up_thread is not None:
+            return _warm_up_thread
+
+        def run():
+            for name, task in (tasks or _default_warm_up_tasks()).items():
+                start = time.perf_counter()
+                try:
+                    task()
+                except Exception as e:
+                    print(f"Warm-up error ({name}): {e}")
+                _warm_up_times[name] = round(time.perf_counter() - start, 3)
+
+        _warm_up_thread = threading.Thread(target=run, name="warm-up", daemon=True)
+        _warm_up_thread.start()
+        return _warm_up_thread
+
+
+def warm_up_times():
+    """Seconds each warm-up task took, for the tasks finished so far."""
+    return dict(_warm_up_times)
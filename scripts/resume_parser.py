@@ -1,16 +1,72 @@
-import fitz
+from concurrent.futures import ProcessPoolExecutor
+from scripts.metrics import timed
+import time
+import os
 
 
+def _open_pdf(pdf_file):
+    import fitz
+
+    # Paths are opened by MuPDF directly, which reads pages from disk on
+    # demand instead of holding the whole file as a Python bytes object
+    if isinstance(pdf_file, (str, os.PathLike)):
+        return fitz.open(os.fspath(pdf_file), filetype="pdf")
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return fitz.open(stream=pdf_file, filetype="pdf")
+    return fitz.open(stream=pdf_file.read(), filetype="pdf")
+
+
+def iter_pdf_pages(pdf_file, timings=None):
+    """Yields the text of each page in turn.
+
+    pdf_file can be a path, raw bytes or a file-like object. When a list is
+    passed as timings, the extraction time of each page is appended to it.
+    """
+    with _open_pdf(pdf_file) as doc:
+        for page in doc:
+            start_time = time.perf_counter()
+            text = page.get_text()
+            if timings is not None:
+                timings.append(time.perf_counter() - start_time)
+            yield text
+
+
+@timed("pdf_extraction")
 def extract_text_from_pdf(pdf_file):
     """Extracts text from a PDF file."""
-    text = ""
-    with fitz.open(stream=pdf_file.read(), filetype="pdf") as doc:
-        for page in doc:
-            text += page.get_text()
-    return text
+    return "".join(iter_pdf_pages(pdf_file))
+
+
+def extract_text_with_timings(pdf_file):
+    """Returns the text and a list of per-page extraction times in seconds."""
+    timings = []
+    text = "".join(iter_pdf_pages(pdf_file, timings))
+    return text, timings
+
+
+def _extract_path(path):
+    try:
+        return extract_text_from_pdf(path)
+    except Exception as e:
+        print(f"PDF extraction error for {path}: {e}")
+        return None
+
+
+def extract_texts_parallel(paths, max_workers=None, chunksize=4):
+    """Extracts many PDFs in a process pool.
+
+    Returns one text per path in input order, None for files that failed.
+    """
+    paths = [os.fspath(path) for path in paths]
+    if len(paths) <= 1:
+        return [_extract_path(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_extract_path, paths, chunksize=chunksize))
 
 
 if __name__ == "__main__":
-    with open("../uploads/Ujjwal Tyagi Resume.pdf", "rb") as pdf_file:
-        resume_text = extract_text_from_pdf(pdf_file)
+    resume_text, page_timings = extract_text_with_timings(
+        "../uploads/Ujjwal Tyagi Resume.pdf"
+    )
     print(resume_text)
+    print("Page timings:", [round(t, 4) for t in page_timings])
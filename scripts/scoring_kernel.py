@@ -0,0 +1,148 @@
+from scripts.constants import EDUCATION_KEYWORDS, JOB_ROLES
+from scripts.taxonomy import TAXONOMY
+from scripts.matcher import (
+    SKILL_WEIGHT,
+    EDU_WEIGHT,
+    ROLE_WEIGHT,
+    EXP_WEIGHT,
+    SEMANTIC_WEIGHT,
+    KEYWORD_WEIGHT,
+)
+import numpy as np
+
+EDU_INDEX = {keyword: i for i, keyword in enumerate(EDUCATION_KEYWORDS)}
+ROLE_INDEX = {role: i for i, role in enumerate(JOB_ROLES)}
+
+
+def pack_bitsets(bitsets, n_bits):
+    """Packs Python int bitsets into a (len(bitsets), ceil(n_bits / 8)) uint8 array."""
+    n_bytes = (n_bits + 7) // 8
+    buffer = b"".join(bits.to_bytes(n_bytes, "little") for bits in bitsets)
+    return np.frombuffer(buffer, dtype=np.uint8).reshape(len(bitsets), n_bytes)
+
+
+def _indicator(sets, index):
+    matrix = np.zeros((len(sets), len(index)), dtype=np.uint8)
+    for row, terms in enumerate(sets):
+        for term in terms:
+            column = index.get(term)
+            if column is not None:
+                matrix[row, column] = 1
+    return np.packbits(matrix, axis=1, bitorder="little")
+
+
+def build_matrices(embeddings, profiles):
+    """Turns embeddings and keyword profiles into the arrays score_blocks uses.
+
+    Embeddings are L2-normalized float32, skills/education/roles are packed
+    bitsets and experience is a float vector.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return {
+        "embeddings": embeddings / np.maximum(norms, 1e-12),
+        "skills": pack_bitsets([p["skill_bits"] for p in profiles], len(TAXONOMY)),
+        "n_skills": len(TAXONOMY),
+        "edu": _indicator([p["edu"] for p in profiles], EDU_INDEX),
+        "n_edu": len(EDU_INDEX),
+        "roles": _indicator([p["roles"] for p in profiles], ROLE_INDEX),
+        "n_roles": len(ROLE_INDEX),
+        "exp": np.array([p["exp"] for p in profiles], dtype=np.float64),
+    }
+
+
+def _unpack(packed, n_bits):
+    return np.unpackbits(packed, axis=1, count=n_bits, bitorder="little").astype(
+        np.float32
+    )
+
+
+def _score_block(resumes, jds, rows, jd_dense):
+    semantic = resumes["embeddings"][rows] @ jds["embeddings"].T
+
+    skills = _unpack(resumes["skills"][rows], resumes["n_skills"])
+    skill_ratio = (skills @ jd_dense["skills"].T) / jd_dense["skill_counts"]
+
+    edu = _unpack(resumes["edu"][rows], resumes["n_edu"])
+    edu_ratio = (edu @ jd_dense["edu"].T) / jd_dense["edu_counts"]
+
+    roles = _unpack(resumes["roles"][rows], resumes["n_roles"])
+    role_match = (roles @ jd_dense["roles"].T) > 0
+
+    resume_exp = resumes["exp"][rows][:, None]
+    jd_exp = jds["exp"][None, :]
+    exp_ratio = np.where(
+        jd_exp > 0, np.minimum(resume_exp / np.where(jd_exp > 0, jd_exp, 1), 1.0), 1.0
+    )
+
+    keyword = (
+        SKILL_WEIGHT * skill_ratio
+        + EDU_WEIGHT * edu_ratio
+        + ROLE_WEIGHT * role_match
+        + EXP_WEIGHT * exp_ratio
+    )
+    final = SEMANTIC_WEIGHT * semantic + KEYWORD_WEIGHT * keyword
+
+    return {
+        "final_score": np.round(final * 100, 2),
+        "semantic_score": np.round(semantic * 100, 2),
+        "keyword_score": np.round(keyword * 100, 2),
+        "skill_match_ratio": np.round(skill_ratio * 100, 2),
+        "edu_match_ratio": np.round(edu_ratio * 100, 2),
+        "role_match": role_match.astype(np.int8),
+        "exp_match_ratio": np.round(exp_ratio * 100, 2),
+    }
+
+
+def score_blocks(resumes, jds, block_size=1024):
+    """Yields (row_slice, scores) for blocks of block_size resumes.
+
+    scores maps each component of calculate_match_score to a
+    (block, n_jds) array, so peak memory is bounded by block_size * n_jds
+    no matter how many resumes there are.
+    """
+    jd_dense = {
+        "skills": _unpack(jds["skills"], jds["n_skills"]),
+        "edu": _unpack(jds["edu"], jds["n_edu"]),
+        "roles": _unpack(jds["roles"], jds["n_roles"]),
+    }
+    jd_dense["skill_counts"] = np.maximum(jd_dense["skills"].sum(axis=1), 1)
+    jd_dense["edu_counts"] = np.maximum(jd_dense["edu"].sum(axis=1), 1)
+
+    total = len(resumes["exp"])
+    for start in range(0, total, block_size):
+        rows = slice(start, min(start + block_size, total))
+        yield rows, _score_block(resumes, jds, rows, jd_dense)
+
+
+def score_matrix(resumes, jds, block_size=1024):
+    """Full (n_resumes, n_jds) matrices of the final and component scores."""
+    shape = (len(resumes["exp"]), len(jds["exp"]))
+    result = None
+    for rows, block in score_blocks(resumes, jds, block_size):
+        if result is None:
+            result = {name: np.empty(shape, dtype=v.dtype) for name, v in block.items()}
+        for name, values in block.items():
+            result[name][rows] = values
+    return result
+
+
+def top_k_per_jd(resumes, jds, top_k=10, block_size=1024):
+    """Indices and final scores of the best top_k resumes for every JD.
+
+    Keeps only a running top_k per JD across blocks, so the full score
+    matrix is never materialized.
+    """
+    best_scores = np.full((0, len(jds["exp"])), -np.inf)
+    best_rows = np.zeros((0, len(jds["exp"])), dtype=np.int64)
+    for rows, block in score_blocks(resumes, jds, block_size):
+        block_rows = np.arange(rows.start, rows.stop)[:, None].repeat(
+            len(jds["exp"]), axis=1
+        )
+        scores = np.vstack([best_scores, block["final_score"]])
+        indices = np.vstack([best_rows, block_rows])
+        keep = min(top_k, len(scores))
+        order = np.argsort(-scores, axis=0, kind="stable")[:keep]
+        best_scores = np.take_along_axis(scores, order, axis=0)
+        best_rows = np.take_along_axis(indices, order, axis=0)
+    return best_rows.T, best_scores.T
@@ -0,0 +1,95 @@
+from scripts.keyword_matcher import tokenize
+from scripts.experience import extract_years_of_experience
+from scripts.taxonomy import TAXONOMY
+from scripts.constants import (
+    GENERAL_SKILLS,
+    EDUCATION_CATEGORY,
+    JOB_ROLES_CATEGORY,
+    TOOL_SYNONYMS_CATEGORY,
+    KEYWORD_MATCHER,
+)
+from scripts.contact import EMAIL_REGEX, PHONE_REGEX
+from scripts.metrics import timer
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Optional
+
+SKILL_CATEGORIES = (*GENERAL_SKILLS, TOOL_SYNONYMS_CATEGORY)
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeRecord:
+    """Everything the scorers need from one document, extracted once."""
+
+    email: Optional[str]
+    phone: Optional[str]
+    skills: frozenset
+    skill_bits: int
+    education: frozenset
+    roles: frozenset
+    years_experience: float
+
+    def keyword_profile(self):
+        """The profile dict used by matcher._combine_scores and friends."""
+        return {
+            "skills": self.skills,
+            "skill_bits": self.skill_bits,
+            "edu": self.education,
+            "roles": self.roles,
+            "exp": self.years_experience,
+        }
+
+    def to_dict(self):
+        record = asdict(self)
+        # The bitset depends on taxonomy order, so it is rebuilt from skills
+        del record["skill_bits"]
+        for name in ("skills", "education", "roles"):
+            record[name] = sorted(record[name])
+        return record
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            email=data["email"],
+            phone=data["phone"],
+            skills=frozenset(data["skills"]),
+            skill_bits=TAXONOMY.bitset(data["skills"]),
+            education=frozenset(data["education"]),
+            roles=frozenset(data["roles"]),
+            years_experience=data["years_experience"],
+        )
+
+
+@lru_cache(maxsize=1024)
+def parse_document(text):
+    """Parses a resume or JD into a ResumeRecord.
+
+    The text is tokenized once and every vocabulary is matched in the same
+    pass. Results are cached by text, so every scorer that needs the same
+    document shares one parse. Pass the raw text: preprocessing splits
+    emails and phone numbers into tokens, so only the keyword fields are
+    reliable for preprocessed text.
+    """
+    # Timed per stage here rather than around the whole parse, so the
+    # experience scan is not reported as keyword matching
+    with timer("keyword_extraction"):
+        found = KEYWORD_MATCHER.find_in_tokens(tokenize(text))
+        terms = set()
+        for category in SKILL_CATEGORIES:
+            terms.update(found[category])
+        skills = frozenset(TAXONOMY.canonical(term) for term in terms)
+        skill_bits = TAXONOMY.bitset(terms)
+    with timer("experience_extraction"):
+        years_experience = extract_years_of_experience(text)
+
+    email = EMAIL_REGEX.search(text)
+    phone = PHONE_REGEX.search(text)
+    return ResumeRecord(
+        email=email.group() if email else None,
+        phone=phone.group() if phone else None,
+        skills=skills,
+        skill_bits=skill_bits,
+        education=frozenset(found[EDUCATION_CATEGORY]),
+        roles=frozenset(found[JOB_ROLES_CATEGORY]),
+        years_experience=years_experience,
+    )
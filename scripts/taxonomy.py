@@ -0,0 +1,137 @@
+from scripts.constants import GENERAL_SKILLS, TOOL_SYNONYMS
+import hashlib
+import json
+import os
+
+
+def _fingerprint(skills, synonyms):
+    payload = json.dumps([skills, synonyms], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Taxonomy:
+    """Skill vocabulary compiled to integer IDs.
+
+    Every surface form (a skill or one of its TOOL_SYNONYMS) maps to the ID
+    of its canonical skill in O(1), so "github" and "git" share an ID and a
+    skill listed in several categories is stored once. A document's skills
+    become a Python int bitset and overlap is a single AND plus bit_count().
+    """
+
+    def __init__(self, names, categories, surface, fingerprint=None):
+        self.names = names
+        self.categories = categories
+        self.surface = surface
+        self.fingerprint = fingerprint
+        self.category_masks = {}
+        for skill_id, skill_categories in enumerate(categories):
+            mask = 1 << skill_id
+            for category in skill_categories:
+                self.category_masks[category] = (
+                    self.category_masks.get(category, 0) | mask
+                )
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def build(cls, skills=GENERAL_SKILLS, synonyms=TOOL_SYNONYMS):
+        base_of = {}
+        for base, forms in synonyms.items():
+            for form in forms:
+                base_of[form] = base
+
+        names = []
+        categories = []
+        surface = {}
+        ids = {}
+
+        def skill_id(name):
+            if name not in ids:
+                ids[name] = len(names)
+                names.append(name)
+                categories.append([])
+            return ids[name]
+
+        for category, terms in skills.items():
+            for term in terms:
+                canonical = skill_id(base_of.get(term, term))
+                surface[term] = canonical
+                if category not in categories[canonical]:
+                    categories[canonical].append(category)
+        for form, base in base_of.items():
+            surface.setdefault(form, skill_id(base))
+
+        return cls(names, categories, surface, _fingerprint(skills, synonyms))
+
+    def to_dict(self):
+        return {
+            "fingerprint": self.fingerprint,
+            "names": self.names,
+            "categories": self.categories,
+            "surface": self.surface,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["names"], data["categories"], data["surface"], data["fingerprint"]
+        )
+
+    def canonical(self, term):
+        """Canonical skill name for a surface form, or the term itself."""
+        skill_id = self.surface.get(term)
+        return term if skill_id is None else self.names[skill_id]
+
+    def ids(self, terms):
+        surface = self.surface
+        return frozenset(surface[term] for term in terms if term in surface)
+
+    def bitset(self, terms):
+        bits = 0
+        surface = self.surface
+        for term in terms:
+            skill_id = surface.get(term)
+            if skill_id is not None:
+                bits |= 1 << skill_id
+        return bits
+
+    def names_of(self, bits):
+        names = set()
+        while bits:
+            lowest = bits & -bits
+            names.add(self.names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return names
+
+    @staticmethod
+    def overlap(bits_a, bits_b):
+        return (bits_a & bits_b).bit_count()
+
+
+def load_taxonomy(cache_path=None):
+    """Returns the taxonomy from cache_path when it matches constants.py,
+    otherwise builds it and refreshes the cache file."""
+    fingerprint = _fingerprint(GENERAL_SKILLS, TOOL_SYNONYMS)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                data = json.load(f)
+            if data.get("fingerprint") == fingerprint:
+                return Taxonomy.from_dict(data)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Taxonomy cache error: {e}")
+
+    taxonomy = Taxonomy.build()
+    if cache_path:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            with open(cache_path, "w") as f:
+                json.dump(taxonomy.to_dict(), f)
+        except OSError as e:
+            print(f"Taxonomy cache error: {e}")
+    return taxonomy
+
+
+# Compiled once at import; set SAMARTH_TAXONOMY_CACHE to load it from a file
+TAXONOMY = load_taxonomy(os.getenv("SAMARTH_TAXONOMY_CACHE"))
@@ -1,7 +1,106 @@
-from nltk.tokenize import TreebankWordTokenizer
+from scripts.keyword_matcher import TOKEN_REGEX
+from concurrent.futures import ProcessPoolExecutor
+from scripts.metrics import timed
+from functools import lru_cache
+from typing import NamedTuple
+import os
 
+MODES = ("treebank", "fast")
+DEFAULT_MODE = os.getenv("SAMARTH_PREPROCESS_MODE", "treebank")
+# Bumped whenever the preprocessed text changes, so embedding caches and JD
+# indexes built from older output are detected. Version 2 tokenizes line
+# by line: Treebank then splits the final period of every line, not only
+# of the whole document, so the model input differs from version 1.
+PREPROCESS_VERSION = 2
 
-def preprocess_text(text):
-    tokenizer = TreebankWordTokenizer()
-    tokens = tokenizer.tokenize(text.lower())  # Tokenize text
-    return " ".join(tokens)  # Convert list back to string
+
+# The tokenizer is stateless, so one instance serves every call. NLTK is
+# imported on first use since it is slow to import and "fast" mode skips it.
+@lru_cache(maxsize=1)
+def _treebank():
+    from nltk.tokenize import TreebankWordTokenizer
+
+    return TreebankWordTokenizer()
+
+
+class ProcessedText(NamedTuple):
+    """Preprocessed document: the joined string plus its tokens.
+
+    offsets holds (start, end) spans into text.lower() of the original
+    document when requested, otherwise None.
+    """
+
+    text: str
+    tokens: list
+    offsets: list = None
+
+
+def _tokenize_line(line, mode):
+    if mode == "fast":
+        return TOKEN_REGEX.findall(line)
+    return _treebank().tokenize(line)
+
+
+def _line_spans(line, mode):
+    if mode == "fast":
+        return [match.span() for match in TOKEN_REGEX.finditer(line)]
+    return list(_treebank().span_tokenize(line))
+
+
+def preprocess(text, mode=None, offsets=False):
+    """Lowercases and tokenizes text line by line into a ProcessedText.
+
+    mode "treebank" applies the NLTK Treebank rules; "fast" is a single
+    regex pass that yields the same tokens KEYWORD_MATCHER uses, so those
+    tokens can be matched directly without tokenizing again. Treebank
+    treats each line as a sentence end ("led the team." becomes "led the
+    team ."), see PREPROCESS_VERSION.
+    """
+    mode = mode or DEFAULT_MODE
+    if mode not in MODES:
+        raise ValueError(f"Unknown preprocessing mode {mode!r}, expected {MODES}")
+
+    lowered = text.lower()
+    lines = []
+    tokens = []
+    spans = [] if offsets else None
+    line_start = 0
+    # Tokenize line by line so section headings survive for chunking
+    for line in lowered.splitlines(keepends=True):
+        line_tokens = _tokenize_line(line, mode)
+        if line_tokens:
+            lines.append(" ".join(line_tokens))
+            tokens.extend(line_tokens)
+            if offsets:
+                spans.extend(
+                    (line_start + start, line_start + end)
+                    for start, end in _line_spans(line, mode)
+                )
+        line_start += len(line)
+    return ProcessedText("\n".join(lines), tokens, spans)
+
+
+@timed("preprocess_text")
+def preprocess_text(text, mode=None):
+    return preprocess(text, mode).text
+
+
+def _preprocess_chunk(texts, mode, offsets):
+    return [preprocess(text, mode, offsets) for text in texts]
+
+
+def preprocess_batch(texts, mode=None, offsets=False, workers=None, chunk_size=64):
+    """Preprocesses many documents, in a process pool when workers > 1."""
+    texts = list(texts)
+    if not workers or workers <= 1 or len(texts) <= chunk_size:
+        return _preprocess_chunk(texts, mode, offsets)
+
+    chunks = [texts[i : i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _preprocess_chunk,
+            chunks,
+            [mode] * len(chunks),
+            [offsets] * len(chunks),
+        )
+        return [processed for chunk in results for processed in chunk]
@@ -0,0 +1,123 @@
+from scripts.matcher import match_from_embeddings, rank_from_embeddings
+from scripts.text_processing import preprocess_text
+from scripts.embedding_cache import encode_cached
+from scripts.batching import MicroBatcher
+from scripts.registry import get_model, memory_usage
+from scripts import metrics
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from dotenv import load_dotenv
+import argparse
+import asyncio
+import os
+
+load_dotenv()
+
+MAX_BATCH_SIZE = int(os.getenv("SAMARTH_MAX_BATCH_SIZE", "64"))
+MAX_WAIT_MS = float(os.getenv("SAMARTH_MAX_WAIT_MS", "5"))
+
+
+class MatchRequest(BaseModel):
+    resume: str
+    job_description: str
+
+
+class RankRequest(BaseModel):
+    job_description: str
+    resumes: list[str]
+    top_k: int = 10
+
+
+@asynccontextmanager
+async def lifespan(app):
+    model = await asyncio.to_thread(get_model)
+    if model is None:
+        raise RuntimeError("Failed to load AI model")
+    app.state.batcher = MicroBatcher(
+        lambda texts: encode_cached(model, texts),
+        max_batch_size=MAX_BATCH_SIZE,
+        max_wait_ms=MAX_WAIT_MS,
+    )
+    app.state.batcher.start()
+    yield
+    await app.state.batcher.stop()
+
+
+app = FastAPI(title="Samarth – Resume Matcher", lifespan=lifespan)
+
+
+def _preprocess_all(texts):
+    return [preprocess_text(text) for text in texts]
+
+
+@app.get("/health")
+async def health():
+    batcher = app.state.batcher
+    return {
+        "status": "ok",
+        "batches": batcher.batches,
+        "requests": batcher.requests,
+        "memory": memory_usage(),
+    }
+
+
+@app.get("/metrics")
+async def prometheus_metrics(format: str = "prometheus"):
+    if format == "json":
+        return metrics.snapshot()
+    return PlainTextResponse(metrics.render_prometheus())
+
+
+@app.post("/match")
+async def match(request: MatchRequest):
+    if not request.resume.strip() or not request.job_description.strip():
+        raise HTTPException(400, "resume and job_description must not be empty")
+
+    processed_resume, processed_jd = await asyncio.to_thread(
+        _preprocess_all, [request.resume, request.job_description]
+    )
+    resume_embedding, jd_embedding = await app.state.batcher.encode(
+        [processed_resume, processed_jd]
+    )
+    return await asyncio.to_thread(
+        match_from_embeddings,
+        resume_embedding,
+        jd_embedding,
+        processed_resume,
+        processed_jd,
+    )
+
+
+@app.post("/rank")
+async def rank(request: RankRequest):
+    if not request.job_description.strip():
+        raise HTTPException(400, "job_description must not be empty")
+    if not request.resumes:
+        return {"results": []}
+
+    processed = await asyncio.to_thread(
+        _preprocess_all, [request.job_description, *request.resumes]
+    )
+    embeddings = await app.state.batcher.encode(processed)
+    results = await asyncio.to_thread(
+        rank_from_embeddings,
+        embeddings[:1],
+        embeddings[1:],
+        processed[0],
+        processed[1:],
+        request.top_k,
+    )
+    return {"results": results}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Samarth matching API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    uvicorn.run(app, host=args.host, port=args.port)
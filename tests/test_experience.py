@@ -0,0 +1,107 @@
+from scripts.experience import experience_breakdown
+from datetime import date
+import pytest
+
+TODAY = date(2024, 6, 1)
+
+
+def breakdown(text):
+    return experience_breakdown(text, today=TODAY)
+
+
+@pytest.mark.parametrize(
+    "text, years",
+    [
+        ("5+ years of experience in Python", 5.0),
+        ("3-5 years of experience", 3.0),
+        ("Worked on it 5 years ago", 0.0),
+        ("A company established over 30 years ago with 4 years of data", 4.0),
+    ],
+)
+def test_stated_years(text, years):
+    assert breakdown(text)["stated_years"] == years
+
+
+@pytest.mark.parametrize(
+    "text, years",
+    [
+        ("Data Scientist, Acme Jan 2019 – Present", 5.5),
+        ("Analyst, Beta 01/2017-12/2018", 2.0),
+        ("Developer, Gamma 2010 - 2012", 2.0),
+    ],
+)
+def test_date_ranges(text, years):
+    assert breakdown(text)["employment_years"] == years
+
+
+def test_overlapping_ranges_are_counted_once():
+    text = "Experience\nAcme Jan 2018 - Dec 2020\nBeta Jun 2020 - Jun 2022"
+    result = breakdown(text)
+    assert len(result["intervals"]) == 2
+    assert result["employment_years"] == 4.5
+
+
+def test_larger_estimate_wins():
+    text = "2 years of experience\nEngineer, Acme Jan 2019 – Present"
+    assert breakdown(text)["years"] == 5.5
+
+
+def test_education_section_is_skipped():
+    text = "Experience\nAcme 2020 - 2022\nEducation\nB.Sc Physics 2016 - 2019"
+    assert breakdown(text)["employment_years"] == 2.0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Phone: +91 98100 2019-2021",
+        "Phone: 98100-2019-2021",
+        "Call (555) 2019 to 2021",
+        "Employee ID 1234 2019-2021",
+    ],
+)
+def test_range_after_other_digits_is_ignored(text):
+    assert breakdown(text)["employment_years"] == 0.0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "B.Tech, IIT Delhi 2015 - 2019",
+        "Master of Science, Stanford 2013 - 2015",
+        "MBA 2016-2018, CGPA 8.1",
+    ],
+)
+def test_degree_lines_are_ignored_without_heading(text):
+    assert breakdown(text)["employment_years"] == 0.0
+
+
+def test_degree_line_does_not_hide_other_lines():
+    text = "Scrum Master, Acme Ltd 2018 - 2020\nB.Tech 2014-2018"
+    assert breakdown(text)["employment_years"] == 2.0
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Founded in 1998 - 2005",
+        "Experience\nFounded in 1998 - 2005, Acme grew fast",
+        "We are a company established 1998 - 2005",
+    ],
+)
+def test_company_age_range_is_ignored(text):
+    assert breakdown(text)["employment_years"] == 0.0
+
+
+def test_range_without_work_context_is_ignored():
+    assert breakdown("Volunteer 2010 - 2020")["employment_years"] == 0.0
+
+
+def test_range_under_experience_heading_counts():
+    text = "Summary\nVolunteer 2010 - 2020\nExperience\nAcme 2019 - 2021"
+    assert breakdown(text)["employment_years"] == 2.0
+
+
+def test_role_on_previous_line_counts():
+    text = "Data Scientist\nAcme | Jan 2019 - Present"
+    assert breakdown(text)["employment_years"] == 5.5
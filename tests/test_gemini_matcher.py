@@ -0,0 +1,94 @@
+from scripts.gemini_matcher import (
+    StubBackend,
+    clear_cache,
+    get_llm_feedback,
+    get_llm_feedback_async,
+    submit_llm_feedback,
+)
+import asyncio
+import pytest
+
+RESUME = "python sql machine learning"
+JD = "python developer with sql"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def feedback(backend, **kwargs):
+    return asyncio.run(get_llm_feedback_async(RESUME, JD, backend, **kwargs))
+
+
+def test_repeated_request_is_cached():
+    backend = StubBackend()
+    first = get_llm_feedback(RESUME, JD, backend)
+    second = get_llm_feedback(RESUME, JD, backend)
+    assert first == second
+    assert first["score"] > 0
+    assert backend.calls == 1
+
+
+def test_cache_is_keyed_by_resume_and_jd():
+    backend = StubBackend()
+    get_llm_feedback(RESUME, JD, backend)
+    get_llm_feedback(RESUME, "java developer", backend)
+    assert backend.calls == 2
+
+
+def test_timeout_is_passed_to_backend_and_reported():
+    backend = StubBackend(delay=0.2)
+    result = feedback(backend, timeout=0.05, retries=0)
+    assert result["score"] == 0
+    assert "timed out" in result["feedback"][0]
+    assert backend.timeouts == [0.05]
+
+
+def test_timed_out_request_is_not_cached():
+    slow = StubBackend(delay=0.2)
+    feedback(slow, timeout=0.05, retries=0)
+    fast = StubBackend()
+    fast.name = slow.name
+    assert feedback(fast)["score"] > 0
+    assert fast.calls == 1
+
+
+def test_transient_errors_are_retried():
+    backend = StubBackend(failures=2)
+    result = feedback(backend, retries=2)
+    assert result["score"] > 0
+    assert backend.calls == 3
+
+
+def test_gives_up_after_retries():
+    backend = StubBackend(failures=5)
+    result = feedback(backend, retries=1)
+    assert result["score"] == 0
+    assert "Simulated failure 2" in result["feedback"][0]
+    assert backend.calls == 2
+
+
+def test_invalid_json_is_not_retried_or_cached():
+    backend = StubBackend(reply="Sure! Here is the score: 80")
+    result = feedback(backend, retries=2)
+    assert result["score"] == 0
+    assert "invalid JSON" in result["feedback"][0]
+    assert backend.calls == 1
+    feedback(backend, retries=2)
+    assert backend.calls == 2
+
+
+def test_markdown_fenced_reply_is_parsed():
+    backend = StubBackend(
+        reply='```json\n{"score": 70, "feedback": ["a", "b", "c", "d"]}\n```'
+    )
+    assert feedback(backend) == {"score": 70, "feedback": ["a", "b", "c"]}
+
+
+def test_submit_runs_in_background():
+    backend = StubBackend(delay=0.05)
+    future = submit_llm_feedback(RESUME, JD, backend)
+    assert future.result(timeout=5)["score"] > 0
@@ -0,0 +1,194 @@
+from scripts.jd_fetch import (
+    FetchError,
+    FetchResponse,
+    HttpTransport,
+    JDFetcher,
+    JDHttpCache,
+    TransientFetchError,
+    UnsafeURLError,
+    fetch_job_description,
+    resolve_public_address,
+)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scripts import jd_fetch
+import ipaddress
+import threading
+import asyncio
+import pytest
+
+PAGE = b"<html><head><title>Data Scientist</title></head><body>Python</body></html>"
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/",
+        "http://localhost:8000/jobs",
+        "http://10.0.0.5/",
+        "http://192.168.1.1/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "http://0.0.0.0/",
+    ],
+)
+def test_non_public_addresses_are_rejected(url):
+    with pytest.raises(UnsafeURLError):
+        resolve_public_address(url)
+
+
+@pytest.mark.parametrize(
+    "url", ["file:///etc/passwd", "ftp://example.com/", "http:///jobs"]
+)
+def test_other_schemes_and_missing_hosts_are_rejected(url):
+    with pytest.raises(UnsafeURLError):
+        resolve_public_address(url)
+
+
+def test_public_and_allowed_private_addresses_resolve():
+    assert resolve_public_address("https://8.8.8.8/jobs") == (
+        "https",
+        "8.8.8.8",
+        443,
+        ipaddress.ip_address("8.8.8.8"),
+    )
+    assert resolve_public_address("http://127.0.0.1:81/", allow_private=True)[2:] == (
+        81,
+        ipaddress.ip_address("127.0.0.1"),
+    )
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/loop":
+            self.send_response(301)
+            self.send_header("Location", "/loop")
+            self.end_headers()
+            return
+        if self.path.startswith("/redirect"):
+            self.send_response(302)
+            self.send_header("Location", self.path.split("to=", 1)[1])
+            self.end_headers()
+            return
+        body = PAGE * 100 if self.path == "/large" else PAGE
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def port():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def public_test_host(monkeypatch):
+    """Treats public.test as a public host served by the local server;
+    every other host goes through the real check."""
+    resolve = jd_fetch.resolve_public_address
+
+    def fake_resolve(url, allow_private=False):
+        parts = jd_fetch.urlsplit(url)
+        if parts.hostname == "public.test":
+            return (
+                parts.scheme,
+                parts.hostname,
+                parts.port,
+                ipaddress.ip_address("127.0.0.1"),
+            )
+        return resolve(url, allow_private)
+
+    monkeypatch.setattr(jd_fetch, "resolve_public_address", fake_resolve)
+
+
+def fetch(url, transport):
+    return fetch_job_description(url, transport, JDHttpCache())
+
+
+def test_local_server_is_refused_by_default(port):
+    result = fetch(f"http://127.0.0.1:{port}/", HttpTransport())
+    assert result.status == 0
+    assert "non-public" in result.error
+
+
+def test_fetch_with_allow_private(port):
+    result = fetch(f"http://127.0.0.1:{port}/", HttpTransport(allow_private=True))
+    assert result.error is None
+    assert result.title == "Data Scientist"
+
+
+def test_redirects_are_followed(port, public_test_host):
+    url = f"http://public.test:{port}/redirect?to=/job"
+    result = fetch(url, HttpTransport())
+    assert result.error is None
+    assert "Python" in result.text
+
+
+def test_redirect_to_private_address_is_refused(port, public_test_host):
+    url = f"http://public.test:{port}/redirect?to=http://127.0.0.1:{port}/job"
+    result = fetch(url, HttpTransport())
+    assert result.status == 0
+    assert "non-public" in result.error
+
+
+def test_redirect_loop_is_cut_off(port, public_test_host):
+    result = fetch(
+        f"http://public.test:{port}/redirect?to=/redirect?to=/loop", HttpTransport()
+    )
+    assert "redirects" in result.error
+
+
+def test_large_response_is_refused(port):
+    transport = HttpTransport(max_bytes=len(PAGE) * 10, allow_private=True)
+    result = fetch(f"http://127.0.0.1:{port}/large", transport)
+    assert result.status == 0
+    assert "larger than" in result.error
+
+
+class ScriptedTransport:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    async def fetch(self, url, headers):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return FetchResponse(url, reply, {}, PAGE if reply == 200 else b"")
+
+    async def aclose(self):
+        pass
+
+
+def request(transport):
+    fetcher = JDFetcher(transport, JDHttpCache(), retries=1)
+    return asyncio.run(fetcher._request("https://jobs.example/1", {}))
+
+
+def test_unsafe_url_is_not_retried():
+    transport = ScriptedTransport(UnsafeURLError("private"), 200)
+    with pytest.raises(UnsafeURLError):
+        request(transport)
+    assert transport.calls == 1
+
+
+def test_transient_errors_and_5xx_are_retried():
+    transport = ScriptedTransport(TransientFetchError("reset"), 200)
+    assert request(transport).status == 200
+    transport = ScriptedTransport(503, 200)
+    assert request(transport).status == 200
+    transport = ScriptedTransport(FetchError("too large"), 200)
+    with pytest.raises(FetchError):
+        request(transport)
+    assert transport.calls == 1
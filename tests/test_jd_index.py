@@ -0,0 +1,108 @@
+from scripts.embedding_cache import EmbeddingCache
+from scripts.jd_index import JDIndex, VECTORS_FILE
+from scripts import embedding_cache
+import numpy as np
+import hashlib
+import pytest
+import os
+
+DIM = 16
+
+
+class HashModel:
+    """Deterministic stand-in encoder: each text maps to a fixed vector."""
+
+    cache_name = "test-hash-model"
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, **kwargs):
+        self.encoded += len(texts)
+        vectors = []
+        for text in texts:
+            seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            vectors.append(np.random.default_rng(seed).standard_normal(DIM))
+        return np.asarray(vectors, dtype=np.float32)
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "_default_cache", EmbeddingCache())
+
+
+@pytest.fixture
+def model():
+    return HashModel()
+
+
+def test_add_and_search(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(
+        model,
+        ["ds", "web", "ops"],
+        ["data scientist python sql", "web developer react", "devops engineer aws"],
+    )
+    assert len(index) == 3
+    assert "web" in index
+
+    query = model.encode(["web developer react"])[0]
+    results = index.search(query, "web developer react", top_k=1)
+    assert results[0]["jd_id"] == "web"
+
+
+def test_repeated_id_keeps_last_text(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(model, ["a", "b", "a"], ["first", "second", "third"])
+    assert sorted(index.ids) == ["a", "b"]
+    assert len(index) == 2
+    row = index.ids.index("a")
+    expected = model.encode(["third"])[0]
+    expected /= np.linalg.norm(expected)
+    assert np.allclose(index._vectors[row], expected, atol=1e-6)
+
+
+def test_replace_and_delete(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(model, ["a", "b"], ["python", "java"])
+    index.add(model, ["a"], ["python sql"])
+    assert len(index) == 2
+    assert index.alive.count(False) == 1
+
+    index.delete(["b"])
+    assert "b" not in index
+    assert len(index) == 1
+
+
+def test_compact_shrinks_vector_file(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(model, [f"jd{i}" for i in range(5)], [f"text {i}" for i in range(5)])
+    path = os.path.join(str(tmp_path), VECTORS_FILE)
+    assert os.path.getsize(path) > 5 * DIM * 4
+
+    index.delete(["jd1", "jd3"])
+    index.compact()
+    assert index.ids == ["jd0", "jd2", "jd4"]
+    assert index.alive == [True] * 3
+    assert os.path.getsize(path) == 3 * DIM * 4
+
+
+def test_reopen_keeps_rows_and_profiles(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(model, ["a", "b"], ["python sql", "java spring"])
+    index.delete(["b"])
+
+    reopened = JDIndex(str(tmp_path))
+    assert reopened.ids == ["a", "b"]
+    assert len(reopened) == 1
+    assert "python" in reopened.profiles[0]["skills"]
+    assert np.allclose(reopened._vectors[0], index._vectors[0])
+
+
+def test_other_model_is_rejected(tmp_path, model):
+    index = JDIndex(str(tmp_path))
+    index.add(model, ["a"], ["python"])
+    other = HashModel()
+    other.cache_name = "another-model"
+    with pytest.raises(ValueError):
+        index.add(other, ["b"], ["java"])
@@ -0,0 +1,57 @@
+from scripts.pdf_cache import ExtractedPDF, PDFTextCache, extract_pdf_cached
+from scripts import pdf_cache
+import pytest
+
+
+def entry(key, size):
+    return ExtractedPDF(key, "x" * size, ((1, size, 0.0),))
+
+
+def test_memory_evicts_least_recently_used():
+    cache = PDFTextCache(max_bytes=250)
+    cache.put(entry("a", 100))
+    cache.put(entry("b", 100))
+    cache.get("a")
+    cache.put(entry("c", 100))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_oversized_entry_is_kept_alone():
+    cache = PDFTextCache(max_bytes=50)
+    cache.put(entry("a", 10))
+    cache.put(entry("big", 100))
+    assert len(cache) == 1
+    assert cache.get("big") is not None
+
+
+def test_disk_tier_survives_restart_and_evicts(tmp_path):
+    path = str(tmp_path / "pdf_text.sqlite")
+    cache = PDFTextCache(path, max_bytes=250)
+    cache.put(entry("a", 100))
+    cache.put(entry("b", 100))
+    cache.put(entry("c", 100))
+
+    reopened = PDFTextCache(path, max_bytes=250)
+    assert reopened.get("a") is None
+    restored = reopened.get("c")
+    assert restored == entry("c", 100)
+
+
+def test_default_cache_is_memory_only(monkeypatch):
+    monkeypatch.delenv("SAMARTH_PDF_CACHE", raising=False)
+    monkeypatch.setattr(pdf_cache, "_default_cache", None)
+    assert pdf_cache.get_default_pdf_cache()._db is None
+
+
+def test_extraction_is_cached_by_content():
+    fitz = pytest.importorskip("fitz")
+    document = fitz.open()
+    document.new_page().insert_text((72, 72), "Jane Doe python developer")
+    data = document.tobytes()
+
+    cache = PDFTextCache()
+    first = extract_pdf_cached(data, cache)
+    assert "python developer" in first.text
+    assert extract_pdf_cached(bytearray(data), cache) is first
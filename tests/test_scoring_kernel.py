@@ -0,0 +1,77 @@
+from scripts.scoring_kernel import build_matrices, score_matrix, top_k_per_jd
+from scripts.matcher import _combine_scores, _keyword_profile
+import numpy as np
+import pytest
+
+RESUMES = [
+    "data scientist, 5 years of experience in python, sql and machine learning. "
+    "bachelor in computer science",
+    "web developer with react, javascript, html and css. 2 years of experience",
+    "devops engineer: docker, aws, git and linux, 7+ years of experience",
+    "master in computer science, python and tensorflow research",
+    "no relevant keywords here",
+]
+JDS = [
+    "looking for a data scientist with python, sql and 3 years of experience",
+    "frontend developer needed: react, javascript and css",
+    "cloud engineer with aws and docker, bachelor required, 5 years of experience",
+]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = np.random.default_rng(0)
+    resume_embeddings = rng.standard_normal((len(RESUMES), 32)).astype(np.float32)
+    jd_embeddings = rng.standard_normal((len(JDS), 32)).astype(np.float32)
+    resume_profiles = [_keyword_profile(text) for text in RESUMES]
+    jd_profiles = [_keyword_profile(text) for text in JDS]
+    return resume_embeddings, jd_embeddings, resume_profiles, jd_profiles
+
+
+def _expected(corpus):
+    resume_embeddings, jd_embeddings, resume_profiles, jd_profiles = corpus
+    resumes = resume_embeddings / np.linalg.norm(resume_embeddings, axis=1)[:, None]
+    jds = jd_embeddings / np.linalg.norm(jd_embeddings, axis=1)[:, None]
+    return [
+        [
+            _combine_scores(float(resumes[i] @ jds[j]), resume_profiles[i], profile)
+            for j, profile in enumerate(jd_profiles)
+        ]
+        for i in range(len(resume_profiles))
+    ]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 1024])
+def test_matches_combine_scores(corpus, block_size):
+    resume_embeddings, jd_embeddings, resume_profiles, jd_profiles = corpus
+    scores = score_matrix(
+        build_matrices(resume_embeddings, resume_profiles),
+        build_matrices(jd_embeddings, jd_profiles),
+        block_size=block_size,
+    )
+    expected = _expected(corpus)
+    for name in (
+        "final_score",
+        "semantic_score",
+        "keyword_score",
+        "skill_match_ratio",
+        "edu_match_ratio",
+        "role_match",
+        "exp_match_ratio",
+    ):
+        reference = np.array([[row[name] for row in rows] for rows in expected])
+        # float32 kernel versus float64 reference, both rounded to 2 decimals
+        assert np.abs(scores[name] - reference).max() <= 0.011, name
+
+
+def test_top_k_matches_full_matrix(corpus):
+    resume_embeddings, jd_embeddings, resume_profiles, jd_profiles = corpus
+    resumes = build_matrices(resume_embeddings, resume_profiles)
+    jds = build_matrices(jd_embeddings, jd_profiles)
+    final = score_matrix(resumes, jds)["final_score"]
+
+    rows, best = top_k_per_jd(resumes, jds, top_k=2, block_size=2)
+    assert rows.shape == best.shape == (len(JDS), 2)
+    for jd in range(len(JDS)):
+        assert np.allclose(best[jd], np.sort(final[:, jd])[::-1][:2])
+        assert np.allclose(final[rows[jd], jd], best[jd])
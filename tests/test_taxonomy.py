@@ -0,0 +1,64 @@
+from scripts.taxonomy import TAXONOMY, Taxonomy, load_taxonomy
+from scripts.constants import TOOL_SYNONYMS
+import json
+
+
+def test_synonyms_share_an_id():
+    for base, forms in TOOL_SYNONYMS.items():
+        for form in forms:
+            assert TAXONOMY.bitset([form]) == TAXONOMY.bitset([base])
+            assert TAXONOMY.canonical(form) == base
+
+
+def test_unknown_terms_are_ignored():
+    assert TAXONOMY.bitset(["not a skill"]) == 0
+    assert TAXONOMY.canonical("not a skill") == "not a skill"
+
+
+def test_bitset_round_trip():
+    bits = TAXONOMY.bitset(["python", "github", "sql"])
+    assert TAXONOMY.names_of(bits) == {"python", "git", "sql"}
+    assert bits.bit_count() == len(TAXONOMY.ids(["python", "github", "sql"]))
+
+
+def test_overlap_counts_shared_skills():
+    resume = TAXONOMY.bitset(["python", "sql", "docker"])
+    jd = TAXONOMY.bitset(["python", "mysql", "aws"])
+    assert Taxonomy.overlap(resume, jd) == 2
+    assert Taxonomy.overlap(resume, 0) == 0
+
+
+def test_dict_round_trip():
+    restored = Taxonomy.from_dict(json.loads(json.dumps(TAXONOMY.to_dict())))
+    assert restored.names == TAXONOMY.names
+    assert restored.surface == TAXONOMY.surface
+    assert restored.category_masks == TAXONOMY.category_masks
+    assert restored.bitset(["python", "js"]) == TAXONOMY.bitset(["python", "js"])
+
+
+def test_cache_file_is_reused_and_refreshed(tmp_path):
+    path = str(tmp_path / "taxonomy.json")
+    built = load_taxonomy(path)
+    assert load_taxonomy(path).names == built.names
+
+    with open(path) as f:
+        data = json.load(f)
+    data["fingerprint"] = "stale"
+    data["names"] = ["wrong"]
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert load_taxonomy(path).names == built.names
+    with open(path) as f:
+        assert json.load(f)["fingerprint"] == built.fingerprint
+
+
+def test_build_from_custom_vocabulary():
+    taxonomy = Taxonomy.build(
+        {"languages": ["python", "py"], "data": ["python", "sql"]},
+        {"python": ["py"]},
+    )
+    assert len(taxonomy) == 2
+    assert taxonomy.bitset(["py"]) == taxonomy.bitset(["python"])
+    python = taxonomy.bitset(["python"])
+    assert taxonomy.category_masks["languages"] & python
+    assert taxonomy.category_masks["data"] & python